@@ -1,20 +1,158 @@
 
 from flask import Flask, request, jsonify, make_response
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-import sqlite3
-import json
+import apsw
+import orjson
+import queue
+import atexit
+import threading
+import hashlib
+import time
 from datetime import datetime
+from collections import OrderedDict
 import os
+from contextlib import contextmanager
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson for faster (de)serialization"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response, skipping a decode/encode
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default), mimetype=self.mimetype
+        )
 
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 CORS(app)  # Enable CORS for all routes
 
 # Database setup
 DATABASE = 'blog_app.db'
 
+# SQL statements, kept as module constants so the per-connection
+# statement cache reuses their prepared form across requests
+SQL_UPSERT_USER = '''
+    INSERT INTO users (name, email, preferred_topics, reading_level, 
+                     writing_style, target_audience, specializations)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (email) DO UPDATE
+    SET name = excluded.name, preferred_topics = excluded.preferred_topics,
+        reading_level = excluded.reading_level, writing_style = excluded.writing_style,
+        target_audience = excluded.target_audience, specializations = excluded.specializations,
+        updated_at = CURRENT_TIMESTAMP, version = version + 1
+    RETURNING id
+'''
+
+SQL_GET_USER = 'SELECT * FROM users WHERE email = ?'
+
+SQL_GET_USER_VERSION = 'SELECT version FROM users WHERE email = ?'
+
+SQL_GET_BLOGS = '''
+    SELECT b.id, b.title, substr(b.content, 1, 300) as excerpt, b.created_at, b.updated_at,
+           u.name as author_name, u.email as author_email
+    FROM blogs b
+    LEFT JOIN users u ON b.user_id = u.id
+    ORDER BY b.created_at DESC, b.id DESC
+    LIMIT ?
+'''
+
+SQL_GET_BLOGS_AFTER = '''
+    SELECT b.id, b.title, substr(b.content, 1, 300) as excerpt, b.created_at, b.updated_at,
+           u.name as author_name, u.email as author_email
+    FROM blogs b
+    LEFT JOIN users u ON b.user_id = u.id
+    WHERE (b.created_at, b.id) < (?, ?)
+    ORDER BY b.created_at DESC, b.id DESC
+    LIMIT ?
+'''
+
+SQL_GET_BLOGS_VERSION = '''
+    SELECT (SELECT n FROM counters WHERE name = 'blogs_version') as blogs_version,
+           (SELECT n FROM counters WHERE name = 'blogs') as blog_count
+'''
+
+SQL_GET_BLOG = '''
+    SELECT b.id, b.title, b.content, b.created_at, b.updated_at, b.version,
+           u.name as author_name, u.email as author_email
+    FROM blogs b
+    LEFT JOIN users u ON b.user_id = u.id
+    WHERE b.id = ?
+'''
+
+SQL_UPDATE_BLOG = '''
+    UPDATE blogs 
+    SET title = ?, content = ?, updated_at = CURRENT_TIMESTAMP, version = version + 1
+    WHERE id = ?
+'''
+
+SQL_DELETE_BLOG = 'DELETE FROM blogs WHERE id = ?'
+
+SQL_GET_DRAFTS_BY_USER = '''
+    SELECT d.id, d.title, d.content, d.created_at, d.updated_at,
+           u.name as author_name, u.email as author_email
+    FROM drafts d
+    LEFT JOIN users u ON d.user_id = u.id
+    WHERE d.user_id = ?
+    ORDER BY d.updated_at DESC
+'''
+
+SQL_GET_DRAFTS = '''
+    SELECT d.id, d.title, d.content, d.created_at, d.updated_at,
+           u.name as author_name, u.email as author_email
+    FROM drafts d
+    LEFT JOIN users u ON d.user_id = u.id
+    ORDER BY d.updated_at DESC
+'''
+
+SQL_INSERT_POST = {
+    'blogs': 'INSERT INTO blogs (title, content, user_id) VALUES (?, ?, ?)',
+    'drafts': 'INSERT INTO drafts (title, content, user_id) VALUES (?, ?, ?)',
+}
+
+# Blog list pagination
+BLOGS_PAGE_SIZE = 20
+BLOGS_MAX_PAGE_SIZE = 100
+
+# Per-connection pragmas (must be reissued on every new connection)
+CONNECTION_PRAGMAS = (
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA cache_size=-64000',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA mmap_size=268435456',
+    'PRAGMA busy_timeout=5000',
+)
+
+def apply_pragmas(conn):
+    """Apply per-connection performance pragmas"""
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+
+def dict_row(cursor, row):
+    """apsw row tracer returning rows as column-name dictionaries"""
+    return dict(zip((column[0] for column in cursor.getdescription()), row))
+
+def add_column_if_missing(cursor, table, column, definition):
+    """Add a column to an existing table (CREATE TABLE IF NOT EXISTS won't)"""
+    columns = [row[1] for row in cursor.execute(f'PRAGMA table_info({table})')]
+    if column not in columns:
+        cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+
 def init_db():
     """Initialize the database with required tables"""
-    conn = sqlite3.connect(DATABASE)
+    conn = apsw.Connection(DATABASE)
+    
+    # WAL journal mode is persistent, so it only needs to be set once
+    conn.execute('PRAGMA journal_mode=WAL')
+    apply_pragmas(conn)
+    
     cursor = conn.cursor()
     
     # Create users table
@@ -60,15 +198,187 @@ def init_db():
         )
     ''')
     
-    conn.commit()
+    # Row counters maintained by triggers, so totals never need COUNT(*)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS counters (
+            name TEXT PRIMARY KEY,
+            n INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.execute("INSERT OR IGNORE INTO counters (name, n) SELECT 'blogs', COUNT(*) FROM blogs")
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS blogs_count_insert AFTER INSERT ON blogs
+        BEGIN
+            UPDATE counters SET n = n + 1 WHERE name = 'blogs';
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS blogs_count_delete AFTER DELETE ON blogs
+        BEGIN
+            UPDATE counters SET n = n - 1 WHERE name = 'blogs';
+        END
+    ''')
+    
+    # Per-user version validating the parsed-profile cache across workers
+    add_column_if_missing(cursor, 'users', 'version', 'INTEGER NOT NULL DEFAULT 0')
+    
+    # Per-blog version for ETags; updated_at only has 1-second resolution
+    add_column_if_missing(cursor, 'blogs', 'version', 'INTEGER NOT NULL DEFAULT 0')
+    
+    # Bumped on every change that can alter the blog list (including author
+    # renames), so list ETags never go stale within the same second
+    cursor.execute("INSERT OR IGNORE INTO counters (name, n) VALUES ('blogs_version', 0)")
+    for name, event in (
+        ('blogs_version_insert', 'AFTER INSERT ON blogs'),
+        ('blogs_version_update', 'AFTER UPDATE ON blogs'),
+        ('blogs_version_delete', 'AFTER DELETE ON blogs'),
+        ('blogs_version_author', 'AFTER UPDATE OF name ON users'),
+    ):
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {name} {event}
+            BEGIN
+                UPDATE counters SET n = n + 1 WHERE name = 'blogs_version';
+            END
+        ''')
+    
+    # Indexes so listing queries are served in index order without a sort
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_blogs_created ON blogs (created_at DESC)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_blogs_user ON blogs (user_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_drafts_user_updated ON drafts (user_id, updated_at DESC)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_drafts_updated ON drafts (updated_at DESC)')
+    
+    # Refresh planner statistics so the indexes are picked up
+    cursor.execute('ANALYZE')
     conn.close()
 
-def get_db_connection():
-    """Get database connection"""
-    conn = sqlite3.connect(DATABASE)
-    conn.row_factory = sqlite3.Row
+# Connection pool: connections are reused across requests so pragmas
+# and the page cache persist instead of being rebuilt per call
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '8'))
+_pool = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+
+def _create_connection():
+    """Open a new pooled database connection"""
+    conn = apsw.Connection(DATABASE, statementcachesize=256)
+    conn.row_trace = dict_row
+    apply_pragmas(conn)
     return conn
 
+def get_db_connection():
+    """Get a database connection from the pool"""
+    try:
+        return _pool.get_nowait()
+    except queue.Empty:
+        return _create_connection()
+
+def release_db_connection(conn):
+    """Return a connection to the pool, discarding any uncommitted work"""
+    try:
+        if not conn.getautocommit():
+            conn.execute('ROLLBACK')
+        _pool.put_nowait(conn)
+    except (apsw.Error, queue.Full):
+        conn.close()
+
+@contextmanager
+def pooled_connection():
+    """Borrow a pooled connection, returning it (rolled back if needed) even on errors"""
+    conn = get_db_connection()
+    try:
+        yield conn
+    finally:
+        release_db_connection(conn)
+
+@atexit.register
+def close_db_connections():
+    """Close all pooled connections on shutdown"""
+    while True:
+        try:
+            conn = _pool.get_nowait()
+        except queue.Empty:
+            break
+        conn.close()
+
+# Post insertion (shared by blogs and drafts)
+def validate_posts(items):
+    """Return an error message if any post is missing a title or content"""
+    if not isinstance(items, list) or not items:
+        return 'A non-empty list of posts is required'
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not item.get('title') or not item.get('content'):
+            return f'Title and content are required (item {index})'
+    return None
+
+def insert_posts(table, items):
+    """Insert posts into a table inside a single transaction and return their ids"""
+    with pooled_connection() as conn:
+        cursor = conn.cursor()
+        statement = SQL_INSERT_POST[table]
+        
+        # One transaction (and one commit) for the whole batch
+        post_ids = []
+        with conn:
+            for item in items:
+                cursor.execute(statement, (
+                    item['title'],
+                    item['content'],
+                    item.get('user_id')  # Optional user_id
+                ))
+                post_ids.append(conn.last_insert_rowid())
+        return post_ids
+
+# Conditional GET helpers (ETag). Validators come from version counters,
+# not updated_at: CURRENT_TIMESTAMP has 1-second resolution, so a
+# timestamp-based validator misses edits made in the same second.
+def make_etag(*parts):
+    """Build an ETag from the values that identify a resource version"""
+    key = ':'.join(str(part) for part in parts)
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+def is_not_modified(etag):
+    """Check the request's If-None-Match header against the current version"""
+    return bool(request.if_none_match) and request.if_none_match.contains(etag)
+
+def conditional_response(body, etag):
+    """Build a JSON response carrying its ETag"""
+    response = make_response(jsonify(body), 200)
+    response.set_etag(etag)
+    return response
+
+def not_modified_response(etag):
+    """Build an empty 304 response carrying the current ETag"""
+    response = make_response('', 304)
+    response.set_etag(etag)
+    return response
+
+# Parsed user profiles keyed by email, validated against users.version. The
+# version is bumped on every write, so a profile cached by any worker is
+# refetched after an update even within the same second.
+USER_CACHE_SIZE = 1024
+_user_cache = OrderedDict()
+_user_cache_lock = threading.Lock()
+
+def get_cached_user(email, version):
+    """Return the cached profile for email if it is still current"""
+    with _user_cache_lock:
+        entry = _user_cache.get(email)
+        if entry is None or entry[0] != version:
+            return None
+        _user_cache.move_to_end(email)
+        return entry[1]
+
+def cache_user(email, version, user_data):
+    """Store a parsed profile, evicting the least recently used entry"""
+    with _user_cache_lock:
+        _user_cache[email] = (version, user_data)
+        _user_cache.move_to_end(email)
+        if len(_user_cache) > USER_CACHE_SIZE:
+            _user_cache.popitem(last=False)
+
+def invalidate_cached_user(email):
+    """Drop a cached profile after it has been written"""
+    with _user_cache_lock:
+        _user_cache.pop(email, None)
+
 # User Profile endpoints
 @app.route('/api/users', methods=['POST'])
 def create_user():
@@ -81,47 +391,20 @@ def create_user():
         if not data.get('name') or not data.get('email'):
             return jsonify({'error': 'Name and email are required'}), 400
 
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        # Check if user already exists
-        cursor.execute('SELECT id FROM users WHERE email = ?', (data['email'],))
-        existing_user = cursor.fetchone()
-
         # Prepare values for DB
         name = data['name']
         email = data['email']
-        preferred_topics = json.dumps(data.get('preferredTopics', []))
+        preferred_topics = orjson.dumps(data.get('preferredTopics', [])).decode()
         reading_level = data.get('readingLevel', 'intermediate')
         writing_style = data.get('writingStyle', 'formal')
         target_audience = data.get('targetAudience', '')
-        specializations = json.dumps(data.get('specializations', []))
-
-        if existing_user:
-            # Update existing user
-            cursor.execute('''
-                UPDATE users 
-                SET name = ?, preferred_topics = ?, reading_level = ?, 
-                    writing_style = ?, target_audience = ?, specializations = ?,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE email = ?
-            ''', (
-                name,
-                preferred_topics,
-                reading_level,
-                writing_style,
-                target_audience,
-                specializations,
-                email
-            ))
-            user_id = existing_user['id'] if isinstance(existing_user, dict) else existing_user[0]
-        else:
-            # Create new user
-            cursor.execute('''
-                INSERT INTO users (name, email, preferred_topics, reading_level, 
-                                 writing_style, target_audience, specializations)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
+        specializations = orjson.dumps(data.get('specializations', [])).decode()
+
+        with pooled_connection() as conn:
+            cursor = conn.cursor()
+            
+            # Create the user, or update the existing profile for this email
+            cursor.execute(SQL_UPSERT_USER, (
                 name,
                 email,
                 preferred_topics,
@@ -130,10 +413,9 @@ def create_user():
                 target_audience,
                 specializations
             ))
-            user_id = cursor.lastrowid
+            user_id = cursor.fetchone()['id']
 
-        conn.commit()
-        conn.close()
+        invalidate_cached_user(email)
 
         return jsonify({
             'message': 'User profile saved successfully',
@@ -147,25 +429,37 @@ def create_user():
 def get_user(email):
     """Get user profile by email"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM users WHERE email = ?', (email,))
-        user = cursor.fetchone()
+        with pooled_connection() as conn:
+            cursor = conn.cursor()
+            
+            # Cheap version check first; skip the full fetch and JSON parsing on a hit
+            cursor.execute(SQL_GET_USER_VERSION, (email,))
+            version = cursor.fetchone()
+            
+            if not version:
+                return jsonify({'error': 'User not found'}), 404
+            
+            user_data = get_cached_user(email, version['version'])
+            if user_data is not None:
+                return jsonify(user_data), 200
+            
+            cursor.execute(SQL_GET_USER, (email,))
+            user = cursor.fetchone()
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
-        # Convert row to dict and parse JSON fields
-        user_data = dict(user)
-        user_data['preferredTopics'] = json.loads(user_data['preferred_topics'] or '[]')
-        user_data['specializations'] = json.loads(user_data['specializations'] or '[]')
+        # Parse JSON fields
+        user_data = user
+        user_data['preferredTopics'] = orjson.loads(user_data['preferred_topics'] or '[]')
+        user_data['specializations'] = orjson.loads(user_data['specializations'] or '[]')
         
         # Remove internal fields
         user_data.pop('preferred_topics', None)
         user_data.pop('id', None)
+        version = user_data.pop('version')
         
-        conn.close()
+        cache_user(email, version, user_data)
         
         return jsonify(user_data), 200
         
@@ -183,22 +477,7 @@ def create_blog():
         if not data.get('title') or not data.get('content'):
             return jsonify({'error': 'Title and content are required'}), 400
         
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Insert blog post
-        cursor.execute('''
-            INSERT INTO blogs (title, content, user_id)
-            VALUES (?, ?, ?)
-        ''', (
-            data['title'],
-            data['content'],
-            data.get('user_id')  # Optional user_id
-        ))
-        
-        blog_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        blog_id = insert_posts('blogs', [data])[0]
         
         return jsonify({
             'message': 'Blog published successfully',
@@ -208,35 +487,74 @@ def create_blog():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/blogs', methods=['GET'])
-def get_blogs():
-    """Get all published blogs"""
+@app.route('/api/blogs/bulk', methods=['POST'])
+def create_blogs_bulk():
+    """Publish multiple blog posts in a single transaction"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT b.id, b.title, b.content, b.created_at, b.updated_at,
-                   u.name as author_name, u.email as author_email
-            FROM blogs b
-            LEFT JOIN users u ON b.user_id = u.id
-            ORDER BY b.created_at DESC
-        ''')
-        
-        blogs = cursor.fetchall()
+        data = request.get_json()
+        blogs = data.get('blogs') if isinstance(data, dict) else data
         
-        # Convert to list of dictionaries
-        blogs_list = []
-        for blog in blogs:
-            blog_dict = dict(blog)
-            blogs_list.append(blog_dict)
+        # Validate required fields
+        error = validate_posts(blogs)
+        if error:
+            return jsonify({'error': error}), 400
         
-        conn.close()
+        blog_ids = insert_posts('blogs', blogs)
         
         return jsonify({
-            'blogs': blogs_list,
-            'total': len(blogs_list)
-        }), 200
+            'message': 'Blogs published successfully',
+            'blog_ids': blog_ids,
+            'total': len(blog_ids)
+        }), 201
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/blogs', methods=['GET'])
+def get_blogs():
+    """Get a page of published blogs (newest first)"""
+    try:
+        limit = min(request.args.get('limit', BLOGS_PAGE_SIZE, type=int), BLOGS_MAX_PAGE_SIZE)
+        if limit < 1:
+            return jsonify({'error': 'limit must be a positive integer'}), 400
+        
+        # Keyset pagination: the cursor is "<created_at>|<id>" of the last blog seen
+        page_cursor = request.args.get('cursor')
+        if page_cursor:
+            created_at, _, last_id = page_cursor.rpartition('|')
+            if not created_at or not last_id.isdigit():
+                return jsonify({'error': 'Invalid cursor'}), 400
+        
+        with pooled_connection() as conn:
+            cursor = conn.cursor()
+            
+            # The list only changes when a blog is added, updated or deleted
+            cursor.execute(SQL_GET_BLOGS_VERSION)
+            version = cursor.fetchone()
+            blog_count = version['blog_count']
+            etag = make_etag(version['blogs_version'], limit, page_cursor)
+            
+            if is_not_modified(etag):
+                return not_modified_response(etag)
+            
+            # A page is at most BLOGS_MAX_PAGE_SIZE short rows, so it is read in
+            # full and the connection goes back to the pool before responding
+            if page_cursor:
+                cursor.execute(SQL_GET_BLOGS_AFTER, (created_at, int(last_id), limit))
+            else:
+                cursor.execute(SQL_GET_BLOGS, (limit,))
+            blogs = cursor.fetchall()
+        
+        next_cursor = None
+        if len(blogs) == limit:
+            next_cursor = f"{blogs[-1]['created_at']}|{blogs[-1]['id']}"
+        
+        return conditional_response({
+            'blogs': blogs,
+            'count': len(blogs),
+            'total': blog_count,
+            'next_cursor': next_cursor
+        }, etag)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -245,26 +563,20 @@ def get_blogs():
 def get_blog(blog_id):
     """Get a specific blog by ID"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT b.id, b.title, b.content, b.created_at, b.updated_at,
-                   u.name as author_name, u.email as author_email
-            FROM blogs b
-            LEFT JOIN users u ON b.user_id = u.id
-            WHERE b.id = ?
-        ''', (blog_id,))
-        
-        blog = cursor.fetchone()
+        with pooled_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(SQL_GET_BLOG, (blog_id,))
+            blog = cursor.fetchone()
         
         if not blog:
             return jsonify({'error': 'Blog not found'}), 404
         
-        blog_dict = dict(blog)
-        conn.close()
+        etag = make_etag(blog['id'], blog.pop('version'))
         
-        return jsonify(blog_dict), 200
+        if is_not_modified(etag):
+            return not_modified_response(etag)
+        
+        return conditional_response(blog, etag)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -275,28 +587,22 @@ def update_blog(blog_id):
     try:
         data = request.get_json()
         
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        with pooled_connection() as conn:
+            cursor = conn.cursor()
+            
+            # Update blog
+            cursor.execute(SQL_UPDATE_BLOG, (
+                data.get('title'),
+                data.get('content'),
+                blog_id
+            ))
+            
+            # No matching row means the blog does not exist
+            changed = conn.changes()
         
-        # Check if blog exists
-        cursor.execute('SELECT id FROM blogs WHERE id = ?', (blog_id,))
-        if not cursor.fetchone():
+        if changed == 0:
             return jsonify({'error': 'Blog not found'}), 404
         
-        # Update blog
-        cursor.execute('''
-            UPDATE blogs 
-            SET title = ?, content = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        ''', (
-            data.get('title'),
-            data.get('content'),
-            blog_id
-        ))
-        
-        conn.commit()
-        conn.close()
-        
         return jsonify({'message': 'Blog updated successfully'}), 200
         
     except Exception as e:
@@ -306,20 +612,18 @@ def update_blog(blog_id):
 def delete_blog(blog_id):
     """Delete a blog post"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Check if blog exists
-        cursor.execute('SELECT id FROM blogs WHERE id = ?', (blog_id,))
-        if not cursor.fetchone():
+        with pooled_connection() as conn:
+            cursor = conn.cursor()
+            
+            # Delete blog
+            cursor.execute(SQL_DELETE_BLOG, (blog_id,))
+            
+            # No matching row means the blog does not exist
+            changed = conn.changes()
+        
+        if changed == 0:
             return jsonify({'error': 'Blog not found'}), 404
         
-        # Delete blog
-        cursor.execute('DELETE FROM blogs WHERE id = ?', (blog_id,))
-        
-        conn.commit()
-        conn.close()
-        
         return jsonify({'message': 'Blog deleted successfully'}), 200
         
     except Exception as e:
@@ -336,22 +640,7 @@ def save_draft():
         if not data.get('title') or not data.get('content'):
             return jsonify({'error': 'Title and content are required'}), 400
         
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Insert draft
-        cursor.execute('''
-            INSERT INTO drafts (title, content, user_id)
-            VALUES (?, ?, ?)
-        ''', (
-            data['title'],
-            data['content'],
-            data.get('user_id')  # Optional user_id
-        ))
-        
-        draft_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        draft_id = insert_posts('drafts', [data])[0]
         
         return jsonify({
             'message': 'Draft saved successfully',
@@ -361,42 +650,44 @@ def save_draft():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/drafts/bulk', methods=['POST'])
+def save_drafts_bulk():
+    """Save multiple drafts in a single transaction"""
+    try:
+        data = request.get_json()
+        drafts = data.get('drafts') if isinstance(data, dict) else data
+        
+        # Validate required fields
+        error = validate_posts(drafts)
+        if error:
+            return jsonify({'error': error}), 400
+        
+        draft_ids = insert_posts('drafts', drafts)
+        
+        return jsonify({
+            'message': 'Drafts saved successfully',
+            'draft_ids': draft_ids,
+            'total': len(draft_ids)
+        }), 201
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/drafts', methods=['GET'])
 def get_drafts():
     """Get all drafts"""
     try:
         user_id = request.args.get('user_id')
         
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        if user_id:
-            cursor.execute('''
-                SELECT d.id, d.title, d.content, d.created_at, d.updated_at,
-                       u.name as author_name, u.email as author_email
-                FROM drafts d
-                LEFT JOIN users u ON d.user_id = u.id
-                WHERE d.user_id = ?
-                ORDER BY d.updated_at DESC
-            ''', (user_id,))
-        else:
-            cursor.execute('''
-                SELECT d.id, d.title, d.content, d.created_at, d.updated_at,
-                       u.name as author_name, u.email as author_email
-                FROM drafts d
-                LEFT JOIN users u ON d.user_id = u.id
-                ORDER BY d.updated_at DESC
-            ''')
-        
-        drafts = cursor.fetchall()
-        
-        # Convert to list of dictionaries
-        drafts_list = []
-        for draft in drafts:
-            draft_dict = dict(draft)
-            drafts_list.append(draft_dict)
-        
-        conn.close()
+        with pooled_connection() as conn:
+            cursor = conn.cursor()
+            
+            if user_id:
+                cursor.execute(SQL_GET_DRAFTS_BY_USER, (user_id,))
+            else:
+                cursor.execute(SQL_GET_DRAFTS)
+            
+            drafts_list = cursor.fetchall()
         
         return jsonify({
             'drafts': drafts_list,
@@ -407,18 +698,24 @@ def get_drafts():
         return jsonify({'error': str(e)}), 500
 
 # Health check endpoint
+_health_cache = [0.0, b'']
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
-        'status': 'healthy',
-        'message': 'Blog backend is running',
-        'timestamp': datetime.now().isoformat()
-    }), 200
+    # The body only changes with the timestamp, so rebuild it at most once a second
+    now = time.time()
+    if now - _health_cache[0] > 1.0:
+        _health_cache[:] = [now, orjson.dumps({
+            'status': 'healthy',
+            'message': 'Blog backend is running',
+            'timestamp': datetime.now().isoformat()
+        })]
+    return app.response_class(_health_cache[1], status=200, mimetype='application/json')
 
 if __name__ == '__main__':
     # Initialize database
     init_db()
     
-    # Run the app
-    app.run(debug=True, host='0.0.0.0', port=3001)
\ No newline at end of file
+    # Run the development server (use gunicorn.conf.py in production)
+    app.run(debug=os.getenv('FLASK_DEBUG', 'false').lower() == 'true', host='0.0.0.0', port=3001)
\ No newline at end of file
@@ -0,0 +1,20 @@
+# Gunicorn configuration for the Flask blog backend (app.py)
+#
+# Run with:
+#   gunicorn -c gunicorn.conf.py app:app
+#
+# gevent workers monkey-patch the standard library on start-up, so many
+# pending requests can overlap their I/O waits on a single CPU.
+import multiprocessing
+import os
+
+bind = os.getenv('FLASK_BIND', '0.0.0.0:3001')
+worker_class = 'gevent'
+workers = int(os.getenv('FLASK_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+worker_connections = int(os.getenv('FLASK_WORKER_CONNECTIONS', '200'))
+
+
+def on_starting(server):
+    """Create the database schema once, before any worker is forked"""
+    from app import init_db
+    init_db()
@@ -1,23 +1,26 @@
-from fastapi import FastAPI, HTTPException, Depends, Security
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
+import msgspec
+import orjson
 from typing import List, Optional, Dict, Any
 import asyncio
 import logging
+import time
 from datetime import datetime
 from dotenv import load_dotenv
 
 from models import (
     BlogAnalysisRequest, BlogAnalysisResponse,
-    KeywordRecommendationRequest, KeywordRecommendationResponse,
-    BlogPost, UserProfile
+    KeywordRecommendationRequest, KeywordRecommendationResponse, ScoreBatchRequest,
+    BlogPost, UserProfile, decode_blog_analysis_request
 )
 from services.llm_service import LLMService
 from services.agent_service import AgentOrchestrator
 from services.scoring_service import BlogScoringService
-from utils.auth import verify_token
-from utils.retry import retry_with_exponential_backoff
+from utils.auth import AuthASGIMiddleware, auth_cache_stats, init_auth
+from utils.retry import retry_stats, retry_with_exponential_backoff
 from contextlib import asynccontextmanager
 
 load_dotenv()
@@ -29,20 +32,31 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    init_auth()
     await llm_service.initialize()
+    session_gc_task = asyncio.create_task(agent_orchestrator.run_session_gc())
     logger.info("Backend services initialized successfully")
     
     yield  
 
     logger.info("Shutting down services...")
+    session_gc_task.cancel()
+    if agent_orchestrator.redis_store is not None:
+        await agent_orchestrator.redis_store.close()
+    scoring_service.close()
 
 app = FastAPI(
     title="Agentic Blog Support System",
     description="Backend API for intelligent blog writing assistance",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
+# Bearer-token auth for /api/ routes. Added before CORS so CORS wraps it and
+# answers preflights and decorates 401s. Keyword recommendations stay open.
+app.add_middleware(AuthASGIMiddleware, exempt_paths={"/api/recommend-keywords"})
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -52,9 +66,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Security
-security = HTTPBearer()
-
 # Initialize services
 llm_service = LLMService()
 scoring_service = BlogScoringService()
@@ -72,45 +83,82 @@ async def root():
         "timestamp": datetime.utcnow().isoformat()
     }
 
+# The LLM health check is an API round-trip, so reuse its result briefly
+LLM_HEALTH_CACHE_TTL = 5.0
+_llm_health = {"checked_at": 0.0, "result": None}
+
+async def get_llm_health() -> Dict[str, Any]:
+    """LLM health check result, cached for LLM_HEALTH_CACHE_TTL seconds"""
+    now = time.monotonic()
+    if _llm_health["result"] is None or now - _llm_health["checked_at"] > LLM_HEALTH_CACHE_TTL:
+        _llm_health["result"] = await llm_service.health_check()
+        _llm_health["checked_at"] = now
+    return _llm_health["result"]
+
 @app.get("/health")
 async def health_check():
     """Detailed health check"""
     return {
         "status": "healthy",
         "services": {
-            "llm": await llm_service.health_check(),
+            "llm": await get_llm_health(),
             "scoring": scoring_service.health_check(),
-            "agent": agent_orchestrator.health_check()
+            "agent": agent_orchestrator.health_check(),
+            "auth": {"token_caches": auth_cache_stats()}
         },
+        "retried_failures": retry_stats(),
         "timestamp": datetime.utcnow().isoformat()
     }
 
-@app.post("/api/analyze-blogs", response_model=BlogAnalysisResponse)
+def inline_json_schema(model) -> Dict[str, Any]:
+    """JSON schema for a model with its $defs references inlined (for openapi_extra)"""
+    schema = model.model_json_schema()
+    defs = schema.pop("$defs", {})
+
+    def resolve(node):
+        if isinstance(node, dict):
+            if "$ref" in node:
+                return resolve(defs[node["$ref"].rsplit("/", 1)[-1]])
+            return {key: resolve(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [resolve(item) for item in node]
+        return node
+
+    return resolve(schema)
+
+async def parse_blog_analysis_request(request: Request) -> BlogAnalysisRequest:
+    """Parse the analyze-blogs body with msgspec (decode + validate in one pass)"""
+    try:
+        return decode_blog_analysis_request(await request.body())
+    except (msgspec.ValidationError, msgspec.DecodeError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+@app.post(
+    "/api/analyze-blogs",
+    response_model=BlogAnalysisResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": inline_json_schema(BlogAnalysisRequest)}}
+        }
+    }
+)
 async def analyze_blogs(
-    request: BlogAnalysisRequest,
-    credentials: HTTPAuthorizationCredentials = Security(security)
+    request: BlogAnalysisRequest = Depends(parse_blog_analysis_request)
 ):
     """
     Analyze existing blog posts for sentiment, topics, and keywords
     """
     try:
-        # Verify authentication
-        print(credentials.credentials)
-        await verify_token(credentials.credentials)
-        
         logger.info(f"Analyzing {len(request.blog_posts)} blog posts")
         
-        # Use retry mechanism for LLM calls
-        analysis_results = await retry_with_exponential_backoff(
-            agent_orchestrator.analyze_blog_posts,
-            request.blog_posts,
-            max_retries=3
-        )
+        # Posts are analyzed concurrently; each one is retried individually
+        analysis_results = await agent_orchestrator.analyze_blog_posts(request.blog_posts)
         
         logger.info("Blog analysis completed successfully")
         return BlogAnalysisResponse(
             results=analysis_results,
-            total_posts_analyzed=len(request.blog_posts),
+            total_posts_analyzed=len(analysis_results),
             timestamp=datetime.utcnow()
         )
         
@@ -120,16 +168,12 @@ async def analyze_blogs(
 
 @app.post("/api/recommend-keywords", response_model=KeywordRecommendationResponse)
 async def recommend_keywords(
-    request: KeywordRecommendationRequest,
-    # credentials: HTTPAuthorizationCredentials = Security(security)
+    request: KeywordRecommendationRequest
 ):
     """
     Get real-time keyword recommendations for blog writing
     """
     try:
-        # Verify authentication
-        # await verify_token(credentials.credentials)
-        
         logger.info("Generating keyword recommendations")
         
         # Use retry mechanism for LLM calls
@@ -151,16 +195,12 @@ async def recommend_keywords(
 @app.post("/api/score-blog")
 async def score_blog(
     blog_text: str,
-    user_profile: Optional[UserProfile] = None,
-    credentials: HTTPAuthorizationCredentials = Security(security)
+    user_profile: Optional[UserProfile] = None
 ):
     """
     Score a blog post based on multiple factors
     """
     try:
-        # Verify authentication
-        await verify_token(credentials.credentials)
-        
         logger.info("Scoring blog post")
         
         score_result = await scoring_service.calculate_comprehensive_score(
@@ -178,17 +218,42 @@ async def score_blog(
         logger.error(f"Error scoring blog: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Scoring failed: {str(e)}")
 
-@app.get("/api/agent-status")
-async def get_agent_status(
-    credentials: HTTPAuthorizationCredentials = Security(security)
+@app.post("/api/score-batch")
+async def score_batch(
+    request: ScoreBatchRequest
 ):
     """
-    Get current status of the agentic workflow
+    Score several blog posts in one request
     """
     try:
-        # Verify authentication
-        await verify_token(credentials.credentials)
+        logger.info(f"Scoring {len(request.contents)} blog posts")
+        
+        score_results = await scoring_service.score_batch(
+            request.contents, [request.user_profile] * len(request.contents)
+        )
+        
+        return {
+            "results": [
+                {
+                    "score": score_result["overall_score"],
+                    "breakdown": score_result["breakdown"],
+                    "recommendations": score_result["recommendations"]
+                }
+                for score_result in score_results
+            ],
+            "timestamp": datetime.utcnow()
+        }
         
+    except Exception as e:
+        logger.error(f"Error scoring blogs: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Scoring failed: {str(e)}")
+
+@app.get("/api/agent-status")
+async def get_agent_status():
+    """
+    Get current status of the agentic workflow
+    """
+    try:
         status = agent_orchestrator.get_status()
         return status
         
@@ -198,16 +263,12 @@ async def get_agent_status(
 
 @app.post("/api/start-agent-session")
 async def start_agent_session(
-    user_profile: UserProfile,
-    credentials: HTTPAuthorizationCredentials = Security(security)
+    user_profile: UserProfile
 ):
     """
     Start a new agentic writing session
     """
     try:
-        # Verify authentication
-        await verify_token(credentials.credentials)
-        
         session_id = await agent_orchestrator.start_session(user_profile)
         
         return {
@@ -224,16 +285,12 @@ async def start_agent_session(
 async def update_draft(
     session_id: str,
     draft_text: str,
-    cursor_position: Optional[int] = None,
-    credentials: HTTPAuthorizationCredentials = Security(security)
+    cursor_position: Optional[int] = None
 ):
     """
     Update the current draft and get real-time suggestions
     """
     try:
-
-        await verify_token(credentials.credentials)
-        
         suggestions = await agent_orchestrator.update_draft(
             session_id, draft_text, cursor_position
         )
@@ -244,18 +301,46 @@ async def update_draft(
         logger.error(f"Error updating draft: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Draft update failed: {str(e)}")
 
+@app.post("/api/update-draft/stream")
+async def stream_draft_update(
+    session_id: str,
+    draft_text: str,
+    cursor_position: Optional[int] = None
+):
+    """
+    Update the current draft and stream suggestions as newline-delimited JSON,
+    one line per completed agent step
+    """
+    updates = agent_orchestrator.stream_draft_update(session_id, draft_text, cursor_position)
+    try:
+        # Fail before streaming starts if the session is unknown
+        first = await updates.__anext__()
+    except StopAsyncIteration:
+        first = None
+    except Exception as e:
+        logger.error(f"Error updating draft: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Draft update failed: {str(e)}")
+    
+    async def generate():
+        if first is not None:
+            yield orjson.dumps(first) + b"\n"
+        try:
+            async for update in updates:
+                yield orjson.dumps(update) + b"\n"
+        except Exception as e:
+            logger.error(f"Error streaming draft update: {str(e)}")
+            yield orjson.dumps({"stage": "error", "detail": str(e)}) + b"\n"
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
 @app.delete("/api/end-session/{session_id}")
 async def end_session(
-    session_id: str,
-    credentials: HTTPAuthorizationCredentials = Security(security)
+    session_id: str
 ):
     """
     End an agentic writing session
     """
     try:
-        # Verify authentication
-        await verify_token(credentials.credentials)
-        
         summary = await agent_orchestrator.end_session(session_id)
         
         return {
@@ -1,13 +1,42 @@
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_validator
 from typing import List, Optional, Dict, Any
+from typing_extensions import Annotated
 from datetime import datetime
 from enum import Enum
+import msgspec
 
 class SentimentType(str, Enum):
     POSITIVE = "positive"
     NEGATIVE = "negative"
     NEUTRAL = "neutral"
 
+class ReadingLevel(str, Enum):
+    BEGINNER = "beginner"
+    INTERMEDIATE = "intermediate"
+    ADVANCED = "advanced"
+
+class WritingStyle(str, Enum):
+    CASUAL = "casual"
+    FORMAL = "formal"
+    TECHNICAL = "technical"
+    CREATIVE = "creative"
+
+class AnalysisDepth(str, Enum):
+    QUICK = "quick"
+    STANDARD = "standard"
+    DEEP = "deep"
+
+class Severity(str, Enum):
+    LOW = "low"
+    MEDIUM = "medium"
+    HIGH = "high"
+
+class SuggestionType(str, Enum):
+    KEYWORD = "keyword"
+    IMPROVEMENT = "improvement"
+    STRUCTURE = "structure"
+    STYLE = "style"
+
 class BlogPost(BaseModel):
     """Individual blog post model"""
     title: Optional[str] = None
@@ -18,14 +47,24 @@ class BlogPost(BaseModel):
 
 class UserProfile(BaseModel):
     """User profile for personalized recommendations"""
+    model_config = ConfigDict(extra='ignore', defer_build=False)
+
     user_id: str
     preferred_topics: List[str] = Field(default_factory=list)
-    reading_level: str = Field(default="intermediate", pattern="^(beginner|intermediate|advanced)$")
-    writing_style: str = Field(default="formal", pattern="^(casual|formal|technical|creative)$")
+    reading_level: ReadingLevel = ReadingLevel.INTERMEDIATE
+    writing_style: WritingStyle = WritingStyle.FORMAL
     target_audience: Optional[str] = None
     expertise_areas: List[str] = Field(default_factory=list)
     content_goals: Optional[Dict[str, Any]] = None
 
+    _json: Optional[str] = PrivateAttr(default=None)
+
+    def to_json(self) -> str:
+        """JSON form of the profile, serialized once per instance since profiles are not mutated"""
+        if self._json is None:
+            self._json = self.model_dump_json()
+        return self._json
+
 class SentimentAnalysis(BaseModel):
     """Sentiment analysis result"""
     sentiment: SentimentType
@@ -70,12 +109,24 @@ class BlogAnalysisResult(BaseModel):
 
 class BlogAnalysisRequest(BaseModel):
     """Request model for blog analysis"""
-    blog_posts: List[BlogPost] = Field(..., min_items=1, max_items=50)
-    analysis_depth: str = Field(default="standard", pattern="^(quick|standard|deep)$")
+    model_config = ConfigDict(extra='ignore', defer_build=False)
+
+    blog_posts: List[BlogPost] = Field(..., min_length=1, max_length=50)
+    analysis_depth: AnalysisDepth = AnalysisDepth.STANDARD
     include_keywords: bool = True
     include_sentiment: bool = True
     include_topics: bool = True
 
+    @field_validator('blog_posts')
+    @classmethod
+    def validate_blog_posts(cls, v):
+        if not v:
+            raise ValueError('At least one blog post is required')
+        for post in v:
+            if len(post.content.strip()) < 10:
+                raise ValueError('Blog post content must be at least 10 characters')
+        return v
+
 class BlogAnalysisResponse(BaseModel):
     """Response model for blog analysis"""
     results: List[BlogAnalysisResult]
@@ -86,12 +137,21 @@ class BlogAnalysisResponse(BaseModel):
 
 class KeywordRecommendationRequest(BaseModel):
     """Request model for keyword recommendations"""
+    model_config = ConfigDict(extra='ignore', defer_build=False)
+
     current_draft: str = Field(..., min_length=1)
     cursor_context: Optional[str] = None
     user_profile: Optional[UserProfile] = None
     max_suggestions: int = Field(default=10, ge=1, le=50)
     context_window: int = Field(default=100, ge=50, le=500)
 
+    @field_validator('current_draft')
+    @classmethod
+    def validate_draft(cls, v):
+        if len(v.strip()) < 1:
+            raise ValueError('Draft content cannot be empty')
+        return v
+
 class RealtimeScore(BaseModel):
     """Real-time scoring metrics"""
     overall_score: float = Field(..., ge=0.0, le=100.0)
@@ -105,10 +165,17 @@ class WeakSection(BaseModel):
     start_position: int
     end_position: int
     issue_type: str
-    severity: str = Field(..., pattern="^(low|medium|high)$")
+    severity: Severity
     suggestion: str
     confidence: float = Field(..., ge=0.0, le=1.0)
 
+class ScoreBatchRequest(BaseModel):
+    """Request model for scoring several blog posts at once"""
+    model_config = ConfigDict(extra='ignore', defer_build=False)
+
+    contents: List[str] = Field(..., min_length=1, max_length=50)
+    user_profile: Optional[UserProfile] = None
+
 class KeywordRecommendationResponse(BaseModel):
     """Response model for keyword recommendations"""
     keywords: List[KeywordSuggestion]
@@ -125,18 +192,19 @@ class AgentSession(BaseModel):
     current_draft: str = ""
     suggestion_history: List[Dict[str, Any]] = Field(default_factory=list)
     score_history: List[RealtimeScore] = Field(default_factory=list)
+    suggestion_count: int = 0
     created_at: datetime
     last_updated: datetime
     is_active: bool = True
 
 class AgentSuggestion(BaseModel):
     """Agent suggestion during writing"""
-    suggestion_type: str = Field(..., pattern="^(keyword|improvement|structure|style)$")
+    suggestion_type: SuggestionType
     content: str
     position: Optional[int] = None
     confidence: float = Field(..., ge=0.0, le=1.0)
     rationale: str
-    priority: str = Field(..., pattern="^(low|medium|high)$")
+    priority: Severity
 
 class ScoreBreakdown(BaseModel):
     """Detailed score breakdown"""
@@ -159,35 +227,49 @@ class APIResponse(BaseModel):
     token_usage: Optional[TokenUsage] = None
 
 
-class BlogAnalysisRequest(BlogAnalysisRequest):
-    @validator('blog_posts')
-    def validate_blog_posts(cls, v):
-        if not v:
-            raise ValueError('At least one blog post is required')
-        for post in v:
-            if len(post.content.strip()) < 10:
-                raise ValueError('Blog post content must be at least 10 characters')
-        return v
+# msgspec mirrors of hot request models: decode + validate JSON in one pass
 
-class KeywordRecommendationRequest(KeywordRecommendationRequest):
-    @validator('current_draft')
-    def validate_draft(cls, v):
-        if len(v.strip()) < 1:
-            raise ValueError('Draft content cannot be empty')
-        return v
+class BlogPostStruct(msgspec.Struct):
+    """msgspec mirror of BlogPost"""
+    content: Annotated[str, msgspec.Meta(min_length=10)]
+    title: Optional[str] = None
+    tags: Optional[List[str]] = []
+    author: Optional[str] = None
+    created_at: Optional[datetime] = None
 
-class UserProfile(UserProfile):
-    @validator('reading_level')
-    def validate_reading_level(cls, v):
-        valid_levels = ['beginner', 'intermediate', 'advanced']
-        if v not in valid_levels:
-            raise ValueError(f'Reading level must be one of: {valid_levels}')
-        return v
-    
-    @validator('writing_style')
-    def validate_writing_style(cls, v):
-        valid_styles = ['casual', 'formal', 'technical', 'creative']
-        if v not in valid_styles:
-            raise ValueError(f'Writing style must be one of: {valid_styles}')
-        return v
-    
+    def __post_init__(self):
+        if len(self.content.strip()) < 10:
+            raise ValueError('Blog post content must be at least 10 characters')
+
+    def to_pydantic(self) -> BlogPost:
+        # Already validated by msgspec, so skip pydantic validation
+        return BlogPost.model_construct(
+            title=self.title,
+            content=self.content,
+            tags=self.tags,
+            author=self.author,
+            created_at=self.created_at
+        )
+
+class BlogAnalysisRequestStruct(msgspec.Struct):
+    """msgspec mirror of BlogAnalysisRequest"""
+    blog_posts: Annotated[List[BlogPostStruct], msgspec.Meta(min_length=1, max_length=50)]
+    analysis_depth: AnalysisDepth = AnalysisDepth.STANDARD
+    include_keywords: bool = True
+    include_sentiment: bool = True
+    include_topics: bool = True
+
+    def to_pydantic(self) -> BlogAnalysisRequest:
+        return BlogAnalysisRequest.model_construct(
+            blog_posts=[post.to_pydantic() for post in self.blog_posts],
+            analysis_depth=self.analysis_depth,
+            include_keywords=self.include_keywords,
+            include_sentiment=self.include_sentiment,
+            include_topics=self.include_topics
+        )
+
+_blog_analysis_request_decoder = msgspec.json.Decoder(BlogAnalysisRequestStruct)
+
+def decode_blog_analysis_request(raw: bytes) -> BlogAnalysisRequest:
+    """Decode and validate a raw JSON blog analysis request"""
+    return _blog_analysis_request_decoder.decode(raw).to_pydantic()
@@ -1,24 +1,57 @@
 import asyncio
-import json
+import difflib
+import hashlib
+import heapq
 import logging
-from typing import Dict, List, Any, Optional
+import os
+import re
+import time
+from operator import attrgetter
+from statistics import fmean
+from typing import AsyncIterator, Dict, List, Any, Optional
 from datetime import datetime, timedelta
 import uuid
+from collections import Counter
 from dataclasses import dataclass, asdict
 from enum import Enum
 
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
 from typing_extensions import TypedDict
 
 from models import (
     BlogPost, UserProfile, BlogAnalysisResult, 
-    KeywordRecommendationResponse, AgentSession,
-    AgentSuggestion, RealtimeScore, WeakSection
+    KeywordRecommendationResponse, KeywordSuggestion, AgentSession,
+    AgentSuggestion, RealtimeScore
 )
+from utils.retry import retry_with_exponential_backoff
+from utils.cache import SimilarityIndex, TTLCache
+from utils.redis_store import RedisStore
 
 logger = logging.getLogger(__name__)
 
+# Upper bounds on per-session and per-user history kept in memory
+STATE_HISTORY_LIMIT = 20
+SESSION_HISTORY_LIMIT = 100
+HISTORICAL_PATTERNS_LIMIT = 100
+
+# Analysed posts carry no author, so their patterns are pooled under one key
+# that keyword generation reads back for every user
+HISTORICAL_PATTERNS_KEY = 'general'
+
+# Workflow passes per update and the step budget they need (five nodes per pass)
+MAX_WORKFLOW_ITERATIONS = 2
+WORKFLOW_RECURSION_LIMIT = 5 * MAX_WORKFLOW_ITERATIONS + 2
+
+# Relative change in draft length that warrants another workflow pass
+SIGNIFICANT_CHANGE_RATIO = 0.2
+
+# A sentence runs from its first word to the next terminator or line break
+_SENTENCE_RE = re.compile(r'[^.!?\s][^.!?\n]*')
+
+# Keyword terms boosted when the matching score dimension is low
+_READABILITY_TERMS = frozenset({'simple', 'clear', 'easy'})
+_SEO_TERMS = frozenset({'keyword', 'search', 'optimize'})
+
 class AgentState(TypedDict):
     """State for the Langraph agent"""
     session_id: str
@@ -30,6 +63,8 @@ class AgentState(TypedDict):
     current_score: Dict[str, float]
     iteration_count: int
     last_updated: str
+    final_response: Dict[str, Any]
+    run_id: str
 
 class AgentAction(Enum):
     """Available agent actions"""
@@ -64,12 +99,49 @@ class AgentOrchestrator:
     def __init__(self, llm_service, scoring_service):
         self.llm_service = llm_service
         self.scoring_service = scoring_service
-        self.active_sessions: Dict[str, AgentSession] = {}
-        self.analysis_cache: Dict[str, Dict[str, Any]] = {}
+        # Sessions abandoned without end_session expire after a period of inactivity
+        self.active_sessions = TTLCache(
+            maxsize=int(os.getenv("AGENT_MAX_SESSIONS", "10000")),
+            ttl=float(os.getenv("AGENT_SESSION_TIMEOUT", "3600")),
+            on_evict=self._on_session_evicted
+        )
+        self.analysis_cache = TTLCache(maxsize=5000, ttl=600)
+        self.session_gc_interval = float(os.getenv("AGENT_SESSION_GC_INTERVAL", "60"))
         self.historical_patterns: Dict[str, List[Dict[str, Any]]] = {}
+        # When each local pattern list was last refreshed from Redis
+        self.patterns_refreshed_at: Dict[str, float] = {}
+        self.pattern_refresh_interval = float(os.getenv("AGENT_PATTERN_REFRESH_INTERVAL", "30"))
+        self.success_counts_cache: Dict[int, tuple] = {}
         
-        # Initialize Langraph workflow
-        self.memory = MemorySaver()
+        # Optional Redis level shared by all workers, behind the in-process caches
+        self.redis_store = RedisStore.from_env(pattern_limit=HISTORICAL_PATTERNS_LIMIT)
+        
+        # Short-lived cache of LLM keyword recommendations for repeated drafts
+        self.recommendation_cache = TTLCache(
+            maxsize=int(os.getenv("AGENT_ANALYSIS_CACHE_SIZE", "1000")),
+            ttl=float(os.getenv("RECOMMENDATION_CACHE_TTL", "60"))
+        )
+        # Near-duplicate drafts (a few keystrokes apart) reuse a cached recommendation
+        self.similar_drafts = SimilarityIndex(
+            maxsize=int(os.getenv("SIMILAR_DRAFTS_INDEX_SIZE", "512")),
+            threshold=float(os.getenv("DRAFT_SIMILARITY_THRESHOLD", "0.97"))
+        )
+        self.session_cache_keys: Dict[str, set] = {}
+        
+        # Last analyzed draft and in-flight workflow run per session, used to
+        # skip or coalesce updates that would not change the suggestions
+        self.last_analyzed_drafts: Dict[str, str] = {}
+        # Workflow state carried across a session's updates
+        self.session_states: Dict[str, AgentState] = {}
+        # In-flight run per session with the draft it analyzes, and the one
+        # follow-up run queued behind it for the latest differing draft
+        self.inflight_updates: Dict[str, tuple[str, asyncio.Future]] = {}
+        self.follow_up_updates: Dict[str, asyncio.Task] = {}
+        self.queued_drafts: Dict[str, tuple[str, Optional[int]]] = {}
+        self.draft_change_threshold = float(os.getenv("DRAFT_CHANGE_THRESHOLD", "0.95"))
+        
+        # Initialize Langraph workflow. Each draft update is a fresh run, so
+        # no checkpointer: snapshotting state at every step buys nothing here
         self.workflow = self._build_workflow()
         
         logger.info("Agent Orchestrator initialized with Langraph workflow")
@@ -80,19 +152,17 @@ class AgentOrchestrator:
         workflow = StateGraph(AgentState)
         
         # Define nodes (agent functions)
-        workflow.add_node("analyze_draft", self._analyze_draft_node)
+        workflow.add_node("analyze_and_score", self._analyze_and_score_node)
         workflow.add_node("generate_keywords", self._generate_keywords_node)
-        workflow.add_node("score_content", self._score_content_node)
         workflow.add_node("identify_weaknesses", self._identify_weaknesses_node)
         workflow.add_node("refine_suggestions", self._refine_suggestions_node)
         workflow.add_node("finalize_response", self._finalize_response_node)
         
         # Define workflow edges
-        workflow.set_entry_point("analyze_draft")
+        workflow.set_entry_point("analyze_and_score")
         
-        workflow.add_edge("analyze_draft", "generate_keywords")
-        workflow.add_edge("generate_keywords", "score_content")
-        workflow.add_edge("score_content", "identify_weaknesses")
+        workflow.add_edge("analyze_and_score", "generate_keywords")
+        workflow.add_edge("generate_keywords", "identify_weaknesses")
         workflow.add_edge("identify_weaknesses", "refine_suggestions")
         workflow.add_edge("refine_suggestions", "finalize_response")
         workflow.add_edge("finalize_response", END)
@@ -102,73 +172,92 @@ class AgentOrchestrator:
             "finalize_response",
             self._should_iterate,
             {
-                "continue": "analyze_draft",
+                "continue": "analyze_and_score",
                 "end": END
             }
         )
         
-        return workflow.compile(checkpointer=self.memory)
+        return workflow.compile()
+    
+    async def _analyze_and_score_node(self, state: AgentState) -> AgentState:
+        """Run draft analysis and content scoring concurrently"""
+        # The two calls are independent and write disjoint state keys,
+        # so overlap their round-trips instead of running them in sequence
+        await asyncio.gather(
+            self._analyze_draft_node(state),
+            self._score_content_node(state)
+        )
+        return state
     
     async def _analyze_draft_node(self, state: AgentState) -> AgentState:
         """Analyze the current draft"""
         try:
-            logger.info(f"Analyzing draft for session {state['session_id']}")
+            logger.info("Analyzing draft for session %s", state['session_id'])
             
             # Get analysis from LLM
-            user_profile = UserProfile(**state['user_profile']) if state['user_profile'] else None
-            analysis = await self.llm_service.recommend_keywords(
+            user_profile = self._state_user_profile(state)
+            analysis = await self._cached_keyword_analysis(
                 state['current_draft'],
-                cursor_context=self._get_cursor_context(state['current_draft'], state['cursor_position']),
-                user_profile=user_profile
+                self._get_cursor_context(state['current_draft'], state['cursor_position']),
+                user_profile,
+                session_id=state['session_id']
             )
             
             # Update state
             state['analysis_history'].append({
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": state['last_updated'],
                 "analysis": analysis,
-                "draft_length": len(state['current_draft'])
+                "draft_length": len(state['current_draft']),
+                "run_id": state['run_id']
             })
+            del state['analysis_history'][:-STATE_HISTORY_LIMIT]
             
             return state
             
         except Exception as e:
-            logger.error(f"Error in analyze_draft_node: {str(e)}")
+            logger.exception("Error in analyze_draft_node: %s", e)
             return state
     
     async def _generate_keywords_node(self, state: AgentState) -> AgentState:
         """Generate contextual keyword suggestions"""
         try:
-            logger.info(f"Generating keywords for session {state['session_id']}")
+            logger.info("Generating keywords for session %s", state['session_id'])
             
             # Use historical patterns for better suggestions
-            historical_context = self._get_historical_context(state['user_profile'])
+            historical_context = await self._get_historical_context(state['user_profile'])
             
             # Enhanced keyword generation with context
             current_analysis = state['analysis_history'][-1]['analysis'] if state['analysis_history'] else {}
-            keywords = current_analysis.get('keywords', [])
+            # Plain dict copies: the analysis may be a shared cache entry, and
+            # streamed stages are serialized as they are
+            keywords = [
+                keyword.model_dump() if isinstance(keyword, KeywordSuggestion) else dict(keyword)
+                for keyword in current_analysis.get('keywords', [])
+            ]
             
             # Apply historical learning
             refined_keywords = self._apply_historical_learning(keywords, historical_context)
             
             # Update state
             state['previous_suggestions'].append({
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": state['last_updated'],
                 "keywords": refined_keywords,
                 "context": "historical_pattern_applied"
             })
+            del state['previous_suggestions'][:-STATE_HISTORY_LIMIT]
             
             return state
             
         except Exception as e:
-            logger.error(f"Error in generate_keywords_node: {str(e)}")
+            logger.exception("Error in generate_keywords_node: %s", e)
             return state
     
     async def _score_content_node(self, state: AgentState) -> AgentState:
         """Score the current content"""
         try:
-            logger.info(f"Scoring content for session {state['session_id']}")
+            logger.info("Scoring content for session %s", state['session_id'])
             
-            user_profile = UserProfile(**state['user_profile']) if state['user_profile'] else None
+            user_profile = self._state_user_profile(state)
             score_result = await self.scoring_service.calculate_comprehensive_score(
                 state['current_draft'], user_profile
             )
@@ -179,21 +268,23 @@ class AgentOrchestrator:
             return state
             
         except Exception as e:
-            logger.error(f"Error in score_content_node: {str(e)}")
+            logger.exception("Error in score_content_node: %s", e)
             return state
     
     async def _identify_weaknesses_node(self, state: AgentState) -> AgentState:
         """Identify weak sections in the content"""
         try:
-            logger.info(f"Identifying weaknesses for session {state['session_id']}")
+            logger.info("Identifying weaknesses for session %s", state['session_id'])
             weak_sections = []
             content = state['current_draft']
-            sentences = content.split('. ')
-            for i, sentence in enumerate(sentences):
+            for match in _SENTENCE_RE.finditer(content):
+                sentence = match.group().rstrip()
+                start = match.start()
+                end = start + len(sentence)
                 if len(sentence) < 10:  # Too short
                     weak_sections.append({
-                        "start_position": content.find(sentence),
-                        "end_position": content.find(sentence) + len(sentence),
+                        "start_position": start,
+                        "end_position": end,
                         "issue_type": "sentence_too_short",
                         "severity": "medium",
                         "suggestion": "Consider expanding this sentence with more detail",
@@ -207,13 +298,13 @@ class AgentOrchestrator:
             return state
             
         except Exception as e:
-            logger.error(f"Error in identify_weaknesses_node: {str(e)}")
+            logger.exception("Error in identify_weaknesses_node: %s", e)
             return state
     
     async def _refine_suggestions_node(self, state: AgentState) -> AgentState:
         """Refine suggestions based on context and history"""
         try:
-            logger.info(f"Refining suggestions for session {state['session_id']}")
+            logger.info("Refining suggestions for session %s", state['session_id'])
             
             # Get latest suggestions
             latest_suggestions = state['previous_suggestions'][-1] if state['previous_suggestions'] else {}
@@ -234,40 +325,43 @@ class AgentOrchestrator:
             return state
             
         except Exception as e:
-            logger.error(f"Error in refine_suggestions_node: {str(e)}")
+            logger.exception("Error in refine_suggestions_node: %s", e)
             return state
     
     async def _finalize_response_node(self, state: AgentState) -> AgentState:
         """Finalize the response for the client"""
         try:
-            logger.info(f"Finalizing response for session {state['session_id']}")
+            logger.info("Finalizing response for session %s", state['session_id'])
             
             # Prepare final response structure
             latest_analysis = state['analysis_history'][-1] if state['analysis_history'] else {}
             latest_suggestions = state['previous_suggestions'][-1] if state['previous_suggestions'] else {}
             
+            # One timestamp per pass, shared with the next iteration's nodes
+            timestamp = datetime.utcnow().isoformat()
+            
             # Create comprehensive response
             state['final_response'] = {
                 "keywords": latest_suggestions.get('refined_keywords', []),
                 "realtime_score": state['current_score'],
                 "weak_sections": latest_analysis.get('weak_sections', []),
                 "suggestions_context": f"Analysis iteration {state['iteration_count']}",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": timestamp
             }
             
             state['iteration_count'] = state.get('iteration_count', 0) + 1
-            state['last_updated'] = datetime.utcnow().isoformat()
+            state['last_updated'] = timestamp
             
             return state
             
         except Exception as e:
-            logger.error(f"Error in finalize_response_node: {str(e)}")
+            logger.exception("Error in finalize_response_node: %s", e)
             return state
     
     def _should_iterate(self, state: AgentState) -> str:
         """Determine if workflow should continue iterating"""
         # Simple iteration logic - can be made more sophisticated
-        max_iterations = 2
+        max_iterations = MAX_WORKFLOW_ITERATIONS
         current_iterations = state.get('iteration_count', 0)
         
         if current_iterations < max_iterations:
@@ -279,15 +373,25 @@ class AgentOrchestrator:
     
     def _content_changed_significantly(self, state: AgentState) -> bool:
         """Check if content has changed significantly since last analysis"""
-        if len(state['analysis_history']) < 2:
+        # Entries carried over from earlier updates describe other drafts
+        run_entries = [entry for entry in state['analysis_history'] if entry.get('run_id') == state['run_id']]
+        if len(run_entries) < 2:
             return False
         
         current_length = len(state['current_draft'])
-        previous_length = state['analysis_history'][-2].get('draft_length', 0)
+        previous_length = run_entries[-2].get('draft_length', 0)
         
-        # Consider significant if 20% change in length
-        change_ratio = abs(current_length - previous_length) / max(previous_length, 1)
-        return change_ratio > 0.2
+        # Compare against a scaled threshold rather than dividing
+        return abs(current_length - previous_length) > SIGNIFICANT_CHANGE_RATIO * max(previous_length, 1)
+    
+    def _state_user_profile(self, state: AgentState) -> Optional[UserProfile]:
+        """UserProfile for the state's session, reusing the validated session model"""
+        if not state['user_profile']:
+            return None
+        session = self.active_sessions.get(state['session_id'])
+        if session is not None:
+            return session.user_profile
+        return UserProfile(**state['user_profile'])
     
     def _get_cursor_context(self, content: str, cursor_position: int, context_size: int = 100) -> str:
         """Get text context around cursor position"""
@@ -295,134 +399,384 @@ class AgentOrchestrator:
         end = min(len(content), cursor_position + context_size)
         return content[start:end]
     
-    def _get_historical_context(self, user_profile: Dict[str, Any]) -> Dict[str, Any]:
-        """Get historical patterns for the user"""
-        user_id = user_profile.get('user_id', 'default')
-        return self.historical_patterns.get(user_id, [])
+    async def _get_historical_context(self, user_profile: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Get the historical patterns that keyword generation learns from"""
+        return await self._load_patterns(HISTORICAL_PATTERNS_KEY)
+    
+    async def _load_patterns(self, key: str) -> List[Dict[str, Any]]:
+        """Local pattern list for key, refreshed from Redis at most once per refresh interval"""
+        patterns = self.historical_patterns.setdefault(key, [])
+        if self.redis_store is None:
+            return patterns
+        
+        now = time.monotonic()
+        refreshed_at = self.patterns_refreshed_at.get(key)
+        if refreshed_at is not None and now - refreshed_at < self.pattern_refresh_interval:
+            return patterns
+        
+        try:
+            stored = await self.redis_store.get_patterns(key)
+        except Exception as e:
+            logger.warning("Shared pattern read failed: %s", e)
+            return patterns
+        
+        # Redis holds every worker's patterns, this one's included. Empty results
+        # are remembered too, so an unused key costs one read per interval
+        if stored:
+            patterns[:] = stored[-HISTORICAL_PATTERNS_LIMIT:]
+        self.patterns_refreshed_at[key] = now
+        return patterns
     
     def _apply_historical_learning(self, keywords: List[Dict], historical_context: List[Dict]) -> List[Dict]:
         """Apply historical learning to improve keyword suggestions"""
         if not historical_context:
             return keywords
         
-        # Simple implementation - boost keywords that worked well historically
+        success_counts = self._keyword_success_counts(historical_context)
+        
+        # Boost keywords that worked well historically, once per pattern
         for keyword in keywords:
-            for historical in historical_context:
-                if keyword.get('keyword') in historical.get('successful_keywords', []):
-                    keyword['relevance_score'] = min(1.0, keyword.get('relevance_score', 0.5) * 1.2)
+            count = success_counts.get(keyword.get('keyword'))
+            if count:
+                keyword['relevance_score'] = min(1.0, keyword.get('relevance_score', 0.5) * 1.2 ** count)
         
         return keywords
     
+    def _keyword_success_counts(self, historical_context: List[Dict]) -> Counter:
+        """Count how many historical patterns each keyword succeeded in, memoized per pattern list"""
+        # Pattern lists are appended and trimmed in place, so their length and
+        # last entry identify the current contents
+        last = historical_context[-1]
+        entry = self.success_counts_cache.get(id(historical_context))
+        if entry is not None and entry[0] is historical_context and entry[1] == len(historical_context) and entry[2] is last:
+            return entry[3]
+        
+        success_counts = Counter()
+        for historical in historical_context:
+            success_counts.update(set(historical.get('successful_keywords', [])))
+        self.success_counts_cache[id(historical_context)] = (historical_context, len(historical_context), last, success_counts)
+        return success_counts
+    
     def _contextual_refinement(self, keywords: List[Dict], content: str, cursor_position: int, current_score: Dict) -> List[Dict]:
         """Apply contextual refinement to keywords"""
-        refined_keywords = []
+        low_readability = current_score.get('readability', 70) < 60
+        low_seo = current_score.get('seo', 70) < 60
         
         for keyword in keywords:
             # Boost keywords that improve low-scoring areas
             relevance = keyword.get('relevance_score', 0.5)
             
-            # If readability is low, boost readability-improving keywords
-            if current_score.get('readability', 70) < 60:
-                if any(term in keyword.get('keyword', '').lower() for term in ['simple', 'clear', 'easy']):
+            if low_readability or low_seo:
+                terms = set(keyword.get('keyword', '').lower().split())
+                
+                # If readability is low, boost readability-improving keywords
+                if low_readability and not terms.isdisjoint(_READABILITY_TERMS):
                     relevance *= 1.3
-            
-            # If SEO score is low, boost SEO keywords
-            if current_score.get('seo', 70) < 60:
-                if any(term in keyword.get('keyword', '').lower() for term in ['keyword', 'search', 'optimize']):
+                
+                # If SEO score is low, boost SEO keywords
+                if low_seo and not terms.isdisjoint(_SEO_TERMS):
                     relevance *= 1.2
             
             keyword['relevance_score'] = min(1.0, relevance)
-            refined_keywords.append(keyword)
-        
-        # Sort by relevance
-        refined_keywords.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
         
-        return refined_keywords[:10]  # Return top 10
+        # Return the top 10 by relevance
+        return heapq.nlargest(10, keywords, key=lambda x: x.get('relevance_score', 0))
     
     async def start_session(self, user_profile: UserProfile) -> str:
         """Start a new agentic writing session"""
         try:
             session_id = str(uuid.uuid4())
             
+            now = datetime.utcnow()
             session = AgentSession(
                 session_id=session_id,
                 user_profile=user_profile,
-                created_at=datetime.utcnow(),
-                last_updated=datetime.utcnow()
+                created_at=now,
+                last_updated=now
             )
             
-            self.active_sessions[session_id] = session
+            self.active_sessions.set(session_id, session)
             
-            logger.info(f"Started new agent session: {session_id}")
+            logger.info("Started new agent session: %s", session_id)
             return session_id
             
         except Exception as e:
-            logger.error(f"Error starting session: {str(e)}")
+            logger.error("Error starting session: %s", e)
             raise
     
     async def update_draft(self, session_id: str, draft_text: str, cursor_position: Optional[int] = None) -> Dict[str, Any]:
         """Update draft and get real-time suggestions using Langraph workflow"""
         try:
-            if session_id not in self.active_sessions:
+            session = self.active_sessions.get(session_id)
+            if session is None:
                 raise ValueError(f"Session {session_id} not found")
             
-            session = self.active_sessions[session_id]
             session.current_draft = draft_text
             session.last_updated = datetime.utcnow()
+            # Activity keeps the session alive
+            self.active_sessions.set(session_id, session)
+            
+            # Trivial edits reuse the previous suggestions
+            previous = self._previous_suggestions(session, draft_text)
+            if previous is not None:
+                return previous
+            
+            # A queued follow-up always analyzes the latest draft, so join it
+            follow_up = self.follow_up_updates.get(session_id)
+            if follow_up is not None:
+                self.queued_drafts[session_id] = (draft_text, cursor_position)
+                return await asyncio.shield(follow_up)
+            
+            inflight = self.inflight_updates.get(session_id)
+            if inflight is None:
+                return await asyncio.shield(self._start_run(session, draft_text, cursor_position))
+            
+            # Coalesce with a run in flight for the same draft, give or take a few
+            # keystrokes; anything else runs once that run has finished
+            inflight_draft, future = inflight
+            if self._is_trivial_edit(inflight_draft, draft_text):
+                return await asyncio.shield(future)
+            
+            self.queued_drafts[session_id] = (draft_text, cursor_position)
+            follow_up = asyncio.ensure_future(self._run_follow_up(session, future))
+            self.follow_up_updates[session_id] = follow_up
+            return await asyncio.shield(follow_up)
             
-            # Create initial state for Langraph workflow
-            initial_state = AgentState(
-                session_id=session_id,
-                user_profile=session.user_profile.dict(),
+        except Exception as e:
+            logger.error("Error updating draft: %s", e)
+            raise
+    
+    def _is_trivial_edit(self, previous_draft: str, draft_text: str) -> bool:
+        """Check whether a draft differs too little from the last analyzed one to re-run the workflow"""
+        if previous_draft == draft_text:
+            return True
+        
+        length_change = abs(len(draft_text) - len(previous_draft)) / max(len(previous_draft), 1)
+        if length_change >= 1 - self.draft_change_threshold:
+            return False
+        
+        matcher = difflib.SequenceMatcher(None, previous_draft, draft_text)
+        return (matcher.quick_ratio() > self.draft_change_threshold
+                and matcher.ratio() > self.draft_change_threshold)
+    
+    def _previous_suggestions(self, session: AgentSession, draft_text: str) -> Optional[Dict[str, Any]]:
+        """Last response for the session if the draft is a trivial edit of the one it analyzed"""
+        previous_draft = self.last_analyzed_drafts.get(session.session_id)
+        if (previous_draft is not None and session.suggestion_history
+                and self._is_trivial_edit(previous_draft, draft_text)):
+            return session.suggestion_history[-1]
+        return None
+    
+    def _start_run(self, session: AgentSession, draft_text: str, cursor_position: Optional[int]) -> asyncio.Task:
+        """Start a workflow run and register it as the session's in-flight run"""
+        session_id = session.session_id
+        task = asyncio.ensure_future(self._run_workflow(session, draft_text, cursor_position))
+        self.inflight_updates[session_id] = (draft_text, task)
+        task.add_done_callback(lambda _: self._clear_inflight(session_id, task))
+        return task
+    
+    def _clear_inflight(self, session_id: str, future: asyncio.Future):
+        """Unregister a finished run unless a newer one has taken its place"""
+        inflight = self.inflight_updates.get(session_id)
+        if inflight is not None and inflight[1] is future:
+            del self.inflight_updates[session_id]
+    
+    async def _run_follow_up(self, session: AgentSession, previous: asyncio.Future) -> Dict[str, Any]:
+        """Analyze the latest queued draft once the run ahead of it has finished"""
+        await asyncio.wait({previous})
+        session_id = session.session_id
+        self.follow_up_updates.pop(session_id, None)
+        draft_text, cursor_position = self.queued_drafts.pop(session_id)
+        
+        previous_response = self._previous_suggestions(session, draft_text)
+        if previous_response is not None:
+            return previous_response
+        return await self._start_run(session, draft_text, cursor_position)
+    
+    async def _run_workflow(self, session: AgentSession, draft_text: str, cursor_position: Optional[int]) -> Dict[str, Any]:
+        """Run the Langraph workflow for a draft and record the response on the session"""
+        # Execute Langraph workflow
+        config = {"recursion_limit": WORKFLOW_RECURSION_LIMIT}
+        final_state = await self.workflow.ainvoke(
+            self._workflow_state(session, draft_text, cursor_position), config
+        )
+        
+        # Extract response from final state
+        response = final_state.get('final_response', {})
+        self._record_response(session, draft_text, response, final_state)
+        return response
+    
+    async def stream_draft_update(
+        self,
+        session_id: str,
+        draft_text: str,
+        cursor_position: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Update draft and yield partial suggestions as each workflow node completes"""
+        session = self.active_sessions.get(session_id)
+        if session is None:
+            raise ValueError(f"Session {session_id} not found")
+        
+        session.current_draft = draft_text
+        session.last_updated = datetime.utcnow()
+        self.active_sessions.set(session_id, session)
+        
+        # Runs for a session never overlap: join one already analyzing this
+        # draft, otherwise wait for the runs ahead of this one to finish
+        while True:
+            follow_up = self.follow_up_updates.get(session_id)
+            inflight = self.inflight_updates.get(session_id)
+            if follow_up is None and inflight is None:
+                break
+            if follow_up is None and self._is_trivial_edit(inflight[0], draft_text):
+                response = await asyncio.shield(inflight[1])
+                yield {"stage": "finalize_response", **response}
+                return
+            await asyncio.wait({follow_up if follow_up is not None else inflight[1]})
+        
+        # Trivial edits reuse the previous suggestions
+        previous = self._previous_suggestions(session, draft_text)
+        if previous is not None:
+            yield {"stage": "finalize_response", **previous}
+            return
+        
+        # Register the stream as the in-flight run so updates can coalesce with it
+        done = asyncio.get_running_loop().create_future()
+        self.inflight_updates[session_id] = (draft_text, done)
+        try:
+            config = {"recursion_limit": WORKFLOW_RECURSION_LIMIT}
+            response = {}
+            final_state = None
+            async for chunk in self.workflow.astream(
+                self._workflow_state(session, draft_text, cursor_position), config
+            ):
+                for node, state in chunk.items():
+                    if node == "finalize_response":
+                        response = state.get('final_response', {})
+                        final_state = state
+                    yield self._partial_response(node, state)
+            
+            self._record_response(session, draft_text, response, final_state)
+            done.set_result(response)
+            logger.info("Streamed draft update for session %s", session_id)
+        except Exception as e:
+            done.set_exception(e)
+            # Mark the error retrieved so an unjoined future does not log it
+            done.exception()
+            raise
+        finally:
+            if not done.done():
+                done.cancel()
+            self._clear_inflight(session_id, done)
+    
+    def _partial_response(self, node: str, state: AgentState) -> Dict[str, Any]:
+        """Client payload for the part of the state a workflow node produced"""
+        latest_analysis = state['analysis_history'][-1] if state['analysis_history'] else {}
+        latest_suggestions = state['previous_suggestions'][-1] if state['previous_suggestions'] else {}
+        
+        if node == "analyze_and_score":
+            return {"stage": node, "realtime_score": state['current_score']}
+        if node == "generate_keywords":
+            return {"stage": node, "keywords": latest_suggestions.get('keywords', [])}
+        if node == "identify_weaknesses":
+            return {"stage": node, "weak_sections": latest_analysis.get('weak_sections', [])}
+        if node == "refine_suggestions":
+            return {"stage": node, "keywords": latest_suggestions.get('refined_keywords', [])}
+        return {"stage": node, **state.get('final_response', {})}
+    
+    def _workflow_state(self, session: AgentSession, draft_text: str, cursor_position: Optional[int]) -> AgentState:
+        """Workflow state for a draft update, continuing the session's previous run"""
+        previous = self.session_states.get(session.session_id)
+        if previous is not None:
+            # Keep the bounded histories so refinement sees earlier passes, but
+            # copy them so the run never mutates the recorded state
+            return AgentState(
+                previous,
                 current_draft=draft_text,
                 cursor_position=cursor_position or 0,
-                previous_suggestions=[],
-                analysis_history=[],
-                current_score={},
+                previous_suggestions=[dict(entry) for entry in previous['previous_suggestions']],
+                analysis_history=[dict(entry) for entry in previous['analysis_history']],
                 iteration_count=0,
-                last_updated=datetime.utcnow().isoformat()
+                last_updated=datetime.utcnow().isoformat(),
+                run_id=uuid.uuid4().hex
             )
-            
-            # Execute Langraph workflow
-            config = {"configurable": {"thread_id": session_id}}
-            final_state = await self.workflow.ainvoke(initial_state, config)
-            
-            # Extract response from final state
-            response = final_state.get('final_response', {})
-            
-            # Update session history
-            session.suggestion_history.append(response)
-            
-            logger.info(f"Updated draft for session {session_id}")
-            return response
-            
-        except Exception as e:
-            logger.error(f"Error updating draft: {str(e)}")
-            raise
+        
+        # Create initial state for Langraph workflow
+        return AgentState(
+            session_id=session.session_id,
+            user_profile=session.user_profile.model_dump(),
+            current_draft=draft_text,
+            cursor_position=cursor_position or 0,
+            previous_suggestions=[],
+            analysis_history=[],
+            current_score={},
+            iteration_count=0,
+            last_updated=datetime.utcnow().isoformat(),
+            run_id=uuid.uuid4().hex
+        )
+    
+    def _record_response(
+        self,
+        session: AgentSession,
+        draft_text: str,
+        response: Dict[str, Any],
+        final_state: Optional[AgentState]
+    ):
+        """Update session history with a completed workflow response"""
+        if final_state is not None:
+            self.session_states[session.session_id] = final_state
+        session.suggestion_history.append(response)
+        del session.suggestion_history[:-SESSION_HISTORY_LIMIT]
+        session.suggestion_count += 1
+        self.last_analyzed_drafts[session.session_id] = draft_text
+        
+        logger.info("Updated draft for session %s", session.session_id)
     
     async def analyze_blog_posts(self, blog_posts: List[BlogPost]) -> List[BlogAnalysisResult]:
-        """Analyze multiple blog posts and learn patterns"""
+        """Analyze multiple blog posts concurrently and learn patterns"""
         try:
-            results = []
-            
-            for blog_post in blog_posts:
-                # Analyze individual post
-                analysis = await self.llm_service.analyze_blog_post(blog_post)
-                
-                # Convert to BlogAnalysisResult
-                result = BlogAnalysisResult(**analysis)
-                results.append(result)
-                
-                # Store patterns for learning
-                await self._store_analysis_pattern(blog_post, analysis)
+            # Posts are independent, so overlap their LLM round-trips
+            outcomes = await asyncio.gather(
+                *(self._analyze_one(blog_post) for blog_post in blog_posts),
+                return_exceptions=True
+            )
             
-            logger.info(f"Analyzed {len(blog_posts)} blog posts")
+            # One failed post should not discard the rest of the batch
+            results = []
+            failures = []
+            for blog_post, outcome in zip(blog_posts, outcomes):
+                if isinstance(outcome, Exception):
+                    logger.error("Error analyzing blog post '%s': %s", blog_post.title, outcome)
+                    failures.append(outcome)
+                else:
+                    results.append(outcome)
+            
+            if failures and not results:
+                raise failures[0]
+            
+            logger.info("Analyzed %s of %s blog posts", len(results), len(blog_posts))
             return results
             
         except Exception as e:
-            logger.error(f"Error analyzing blog posts: {str(e)}")
+            logger.error("Error analyzing blog posts: %s", e)
             raise
     
+    async def _analyze_one(self, blog_post: BlogPost) -> BlogAnalysisResult:
+        """Analyze a single post, retrying only this post on failure"""
+        analysis = await retry_with_exponential_backoff(
+            self.llm_service.analyze_blog_post,
+            blog_post,
+            max_retries=3
+        )
+        
+        # Convert to BlogAnalysisResult
+        result = BlogAnalysisResult(**analysis)
+        
+        # Store patterns for learning
+        await self._store_analysis_pattern(blog_post, analysis)
+        
+        return result
+    
     async def recommend_keywords(
         self, 
         current_draft: str, 
@@ -431,24 +785,103 @@ class AgentOrchestrator:
     ) -> KeywordRecommendationResponse:
         """Generate keyword recommendations (non-session based)"""
         try:
-            # Use LLM service directly for non-session recommendations
+            result = await self._cached_keyword_analysis(current_draft, cursor_context, user_profile)
+            
+            # Convert to proper response format in a single validation pass
+            return KeywordRecommendationResponse.model_validate({
+                "keywords": result['keywords'],
+                "realtime_score": result['realtime_score'],
+                "weak_sections": result['weak_sections'],
+                "token_usage": result['token_usage'],
+                "suggestions_context": result['suggestions_context'],
+                "timestamp": datetime.utcnow()
+            })
+            
+        except Exception as e:
+            logger.error("Error generating recommendations: %s", e)
+            raise
+    
+    async def _cached_keyword_analysis(
+        self,
+        current_draft: str,
+        cursor_context: Optional[str],
+        user_profile: Optional[UserProfile],
+        session_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Keyword recommendation from the LLM, served from cache when possible"""
+        cache_key = self._recommendation_cache_key(current_draft, cursor_context, user_profile)
+        scope = user_profile.to_json() if user_profile else ''
+        
+        async def compute() -> Dict[str, Any]:
+            # Fall back to a near-identical draft for the same profile
+            similar_key = self.similar_drafts.nearest(scope, current_draft)
+            if similar_key is not None:
+                similar = self.recommendation_cache.get(similar_key)
+                if similar is not None:
+                    return self._without_positions(similar)
+                self.similar_drafts.discard(similar_key)
+            
+            # Another worker may already have computed it
+            result = await self._load_shared_recommendation(cache_key)
+            if result is not None:
+                return result
+            
             result = await self.llm_service.recommend_keywords(
                 current_draft, cursor_context, user_profile
             )
-            
-            # Convert to proper response format
-            return KeywordRecommendationResponse(
-                keywords=result['keywords'],
-                realtime_score=RealtimeScore(**result['realtime_score']),
-                weak_sections=[WeakSection(**ws) for ws in result['weak_sections']],
-                token_usage=result['token_usage'],
-                suggestions_context=result['suggestions_context'],
-                timestamp=datetime.utcnow()
-            )
-            
+            # Only index fresh results so repeated near matches cannot drift
+            self.similar_drafts.add(cache_key, scope, current_draft)
+            await self._save_shared_recommendation(cache_key, result)
+            return result
+        
+        # Identical drafts (e.g. the user paused typing) are served from cache
+        result = await self.recommendation_cache.get_or_compute(cache_key, compute)
+        if session_id is not None:
+            self.session_cache_keys.setdefault(session_id, set()).add(cache_key)
+        return result
+    
+    def _without_positions(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of a recommendation for another draft, minus offsets that only fit that draft"""
+        keywords = [
+            keyword.model_copy(update={"position_suggestion": None}) if isinstance(keyword, KeywordSuggestion)
+            else {**keyword, "position_suggestion": None}
+            for keyword in result.get('keywords', [])
+        ]
+        return {**result, "keywords": keywords, "weak_sections": []}
+    
+    async def _load_shared_recommendation(self, cache_key: bytes) -> Optional[Dict[str, Any]]:
+        """Look up a recommendation in the shared Redis cache"""
+        if self.redis_store is None:
+            return None
+        try:
+            return await self.redis_store.get_json("rec", cache_key.hex())
         except Exception as e:
-            logger.error(f"Error generating recommendations: {str(e)}")
-            raise
+            logger.warning("Shared recommendation cache read failed: %s", e)
+            return None
+    
+    async def _save_shared_recommendation(self, cache_key: bytes, result: Dict[str, Any]):
+        """Store a recommendation in the shared Redis cache"""
+        if self.redis_store is None:
+            return
+        try:
+            await self.redis_store.set_json("rec", cache_key.hex(), result, self.recommendation_cache.ttl)
+        except Exception as e:
+            logger.warning("Shared recommendation cache write failed: %s", e)
+    
+    def _recommendation_cache_key(
+        self,
+        current_draft: str,
+        cursor_context: Optional[str],
+        user_profile: Optional[UserProfile]
+    ) -> bytes:
+        """Hash the inputs that determine a keyword recommendation"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(current_draft.encode())
+        digest.update(b'|')
+        digest.update((cursor_context or '').encode())
+        digest.update(b'|')
+        digest.update(user_profile.to_json().encode() if user_profile else b'')
+        return digest.digest()
     
     async def _store_analysis_pattern(self, blog_post: BlogPost, analysis: Dict[str, Any]):
         """Store analysis patterns for historical learning"""
@@ -468,53 +901,74 @@ class AgentOrchestrator:
                 "sentiment": analysis.get('sentiment', {}).sentiment if analysis.get('sentiment') else 'neutral'
             }
             
-            # Store pattern
-            user_key = 'general'  # Could be user-specific
-            if user_key not in self.historical_patterns:
-                self.historical_patterns[user_key] = []
+            # Store pattern, after merging what other workers have stored
+            patterns = await self._load_patterns(HISTORICAL_PATTERNS_KEY)
+            patterns.append(pattern)
             
-            self.historical_patterns[user_key].append(pattern)
+            # Keep only recent patterns
+            del patterns[:-HISTORICAL_PATTERNS_LIMIT]
             
-            # Keep only recent patterns (last 100)
-            self.historical_patterns[user_key] = self.historical_patterns[user_key][-100:]
+            if self.redis_store is not None:
+                await self.redis_store.append_pattern(HISTORICAL_PATTERNS_KEY, pattern)
             
         except Exception as e:
-            logger.error(f"Error storing analysis pattern: {str(e)}")
+            logger.exception("Error storing analysis pattern: %s", e)
     
     async def end_session(self, session_id: str) -> Dict[str, Any]:
         """End an agentic writing session"""
         try:
-            if session_id not in self.active_sessions:
+            session = self.active_sessions.pop(session_id)
+            if session is None:
                 raise ValueError(f"Session {session_id} not found")
             
-            session = self.active_sessions[session_id]
             session.is_active = False
             
             # Generate session summary
             summary = {
                 "session_duration": (datetime.utcnow() - session.created_at).total_seconds(),
-                "total_suggestions": len(session.suggestion_history),
+                "total_suggestions": session.suggestion_count,
                 "final_draft_length": len(session.current_draft),
                 "average_score": self._calculate_average_score(session.score_history)
             }
             
-            # Remove from active sessions
-            del self.active_sessions[session_id]
+            self._release_session_state(session_id)
             
-            logger.info(f"Ended session {session_id}")
+            logger.info("Ended session %s", session_id)
             return summary
             
         except Exception as e:
-            logger.error(f"Error ending session: {str(e)}")
+            logger.error("Error ending session: %s", e)
             raise
     
+    def _release_session_state(self, session_id: str):
+        """Drop per-session caches"""
+        self.last_analyzed_drafts.pop(session_id, None)
+        self.session_states.pop(session_id, None)
+        for cache_key in self.session_cache_keys.pop(session_id, ()):
+            self.recommendation_cache.pop(cache_key)
+            self.similar_drafts.discard(cache_key)
+    
+    def _on_session_evicted(self, session_id: str, session: AgentSession):
+        """Clean up after a session that expired or was evicted without end_session"""
+        session.is_active = False
+        self._release_session_state(session_id)
+        logger.info("Expired inactive session %s", session_id)
+    
+    async def run_session_gc(self):
+        """Periodically expire inactive sessions and stale analysis entries"""
+        while True:
+            await asyncio.sleep(self.session_gc_interval)
+            expired = self.active_sessions.expire()
+            self.analysis_cache.expire()
+            if expired:
+                logger.info("Expired %s inactive sessions", expired)
+    
     def _calculate_average_score(self, score_history: List[RealtimeScore]) -> float:
         """Calculate average score from history"""
         if not score_history:
             return 0.0
         
-        total = sum(score.overall_score for score in score_history)
-        return total / len(score_history)
+        return fmean(map(attrgetter('overall_score'), score_history))
     
     def get_status(self) -> Dict[str, Any]:
         """Get current agent orchestrator status"""
@@ -532,7 +986,7 @@ class AgentOrchestrator:
                 "status": "healthy",
                 "active_sessions": len(self.active_sessions),
                 "workflow_initialized": self.workflow is not None,
-                "memory_status": "active",
+                "checkpointing": False,
                 "last_check": datetime.utcnow().isoformat()
             }
         except Exception as e:
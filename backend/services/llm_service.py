@@ -1,20 +1,106 @@
 import os 
 import asyncio
-import json
+import copy
+import hashlib
+import orjson
 import logging
+from collections import Counter
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 import tiktoken
 import google.generativeai as genai
 from google.genai.types import HarmCategory, HarmBlockThreshold
+from google.api_core import exceptions as api_exceptions
+from pydantic import TypeAdapter
 from utils.utils import sanitize_json
+from utils.cache import TTLCache
+from utils.retry import CircuitBreaker, RetryError, retry_with_exponential_backoff
 from models import (
-    BlogPost, UserProfile, SentimentAnalysis, KeyTopic, 
+    BlogPost, UserProfile, SentimentAnalysis, KeyTopic,
     KeywordSuggestion, TokenUsage, BlogAnalysisResult, SentimentType
 )
 
 logger = logging.getLogger(__name__)
 
+# Validate whole result lists in one call instead of one model at a time
+_TOPICS_ADAPTER = TypeAdapter(List[KeyTopic])
+_KEYWORDS_ADAPTER = TypeAdapter(List[KeywordSuggestion])
+
+# Rate limiting and transient server errors, worth retrying after a delay
+RETRYABLE_API_ERRORS = (
+    api_exceptions.ResourceExhausted,
+    api_exceptions.ServiceUnavailable,
+    api_exceptions.InternalServerError,
+    api_exceptions.DeadlineExceeded,
+)
+
+# Texts longer than this are tokenized in a worker thread, off the event loop
+TOKENIZE_OFFLOAD_CHARS = 4096
+
+def _as_int(value: Any) -> int:
+    return int(float(value))
+
+# Per-schema sanitizing rules, applied by a single loop instead of per-schema
+# branches. A field rule is (path, field, low, high, cast): path leads from the
+# response root to the dicts holding the field, and "*" steps into every
+# item of a list. Either bound may be None.
+SANITIZE_RULES = {
+    "blog_analysis": {
+        "limits": [("topics", 5), ("keywords", 10)],
+        "fields": [
+            (("sentiment",), "confidence", 0.0, 1.0, float),
+            (("sentiment", "scores"), "positive", 0.0, 1.0, float),
+            (("sentiment", "scores"), "negative", 0.0, 1.0, float),
+            (("sentiment", "scores"), "neutral", 0.0, 1.0, float),
+            (("topics", "*"), "relevance", 0.0, 1.0, float),
+            (("topics", "*"), "frequency", 1, None, _as_int),
+            (("keywords", "*"), "relevance", 0.0, 1.0, float),
+            (("keywords", "*"), "similarity", 0.0, 1.0, float),
+            ((), "readability", 0, 100, _as_int),
+        ],
+    },
+    "keyword_recommendations": {
+        "limits": [("keywords", 10)],
+        "fields": [
+            (("keywords", "*"), "relevance", 0.0, 1.0, float),
+            (("keywords", "*"), "similarity", 0.0, 1.0, float),
+            (("keywords", "*"), "position", 0, None, _as_int),
+            (("weak_sections", "*"), "confidence", 0.0, 1.0, float),
+            (("weak_sections", "*"), "start", 0, None, _as_int),
+            (("weak_sections", "*"), "end", 0, None, _as_int),
+        ] + [
+            (("scores",), score_type, 0, 100, _as_int)
+            for score_type in ["overall", "readability", "relevance", "engagement", "seo"]
+        ],
+    },
+    "content_scoring": {
+        "limits": [("recommendations", 5)],
+        "fields": [((), "overall_score", 0, 100, _as_int)] + [
+            (("breakdown",), score_type, 0, 100, _as_int)
+            for score_type in ["keyword_relevance", "readability", "user_alignment", "structure", "seo", "engagement"]
+        ],
+    },
+}
+
+def _walk(data: Any, path: tuple):
+    """Yield the dicts reached by following path from data"""
+    if not path:
+        if isinstance(data, dict):
+            yield data
+        return
+    step, rest = path[0], path[1:]
+    if step == "*":
+        if isinstance(data, list):
+            for item in data:
+                yield from _walk(item, rest)
+    elif isinstance(data, dict) and step in data:
+        yield from _walk(data[step], rest)
+
+class _EmptyFields(dict):
+    """Format mapping that renders every placeholder as an empty string"""
+    def __missing__(self, key):
+        return ""
+
 class LLMService:
     """
     LLM Service using Google's Gemini Pro for blog analysis and recommendations.
@@ -34,6 +120,45 @@ class LLMService:
         self.model = None
         self.tokenizer = None
         self.total_tokens_used = 0
+        # The same draft is counted for several prompts and again when truncating.
+        # Keyed by digest so the cache does not hold on to the texts themselves
+        self.token_counts = TTLCache(maxsize=4096, ttl=float(os.getenv("LLM_CACHE_TTL", "3600")))
+        
+        # Cap in-flight Gemini calls to the per-key concurrency the provider allows
+        self.max_concurrency = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+        self.request_semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        # Transient API errors are retried with backoff; once calls keep failing
+        # the breaker opens and requests get the fallback without calling the API
+        self.max_retries = int(os.getenv("LLM_MAX_RETRIES", "2"))
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=int(os.getenv("LLM_BREAKER_THRESHOLD", "5")),
+            timeout=float(os.getenv("LLM_BREAKER_TIMEOUT", "30")),
+            expected_exception=(RetryError,) + RETRYABLE_API_ERRORS
+        )
+        
+        self.temperature = float(os.getenv("LLM_TEMPERATURE", "0.1"))
+        
+        # Parsed responses, reused for identical prompts only: a few changed
+        # words can reverse an analysis. Only near-deterministic sampling is cached.
+        self.cache_responses = self.temperature <= 0.1
+        self.response_cache = TTLCache(
+            maxsize=int(os.getenv("LLM_CACHE_SIZE", "1024")),
+            ttl=float(os.getenv("LLM_CACHE_TTL", "3600"))
+        )
+        # Model calls in flight, shared by concurrent identical prompts
+        self.inflight_requests: Dict[bytes, asyncio.Future] = {}
+        
+        # Keyword requests for a profile that already has one in flight are
+        # collected for the window and sent as one prompt; a window of 0
+        # disables batching
+        self.keyword_batch_window = float(os.getenv("LLM_KEYWORD_BATCH_WINDOW_MS", "100")) / 1000
+        self.keyword_batch_size = int(os.getenv("LLM_KEYWORD_BATCH_SIZE", "8"))
+        self.keyword_batches: Dict[str, tuple] = {}
+        # Unbatched keyword requests in flight per profile
+        self.keyword_requests_inflight: Counter = Counter()
+        # Running batch tasks, referenced until done so they are not garbage collected
+        self.keyword_batch_tasks: set = set()
         
         self.response_schemas = {
             "blog_analysis": {
@@ -158,10 +283,10 @@ class LLMService:
             }
         }
         
+        # Fixed instructions come before the variable input, so every call for a
+        # schema shares the same prompt prefix for the provider's implicit caching
         self.prompts = {
-            "analyze_blog": """Analyze this blog post:
-
-Content: "{content}"
+            "analyze_blog": """Analyze the blog post below.
 
 Return JSON with:
 1. sentiment: {{type: "positive"|"negative"|"neutral", confidence: 0.0-1.0, scores: {{positive: 0.0-1.0, negative: 0.0-1.0, neutral: 0.0-1.0}}}}
@@ -169,30 +294,69 @@ Return JSON with:
 3. keywords: Array of max 10 {{keyword: string, relevance: 0.0-1.0, context: string, similarity: 0.0-1.0}}
 4. readability: number 0-100
 
-Be concise and precise with numeric values.""",
+Be concise and precise with numeric values.
 
-            "recommend_keywords": """Current draft: "{draft}"
-Context: "{cursor_context}"
-Profile: {user_profile}
+Content: "{content}\"""",
+
+            "recommend_keywords": """Recommend keywords and improvements for the draft below.
 
 Return JSON with:
 1. keywords: Array of max 10 {{keyword: string, relevance: 0.0-1.0, context: string, position: integer, similarity: 0.0-1.0}}
 2. weak_sections: Array {{start: int, end: int, issue: string, severity: "low"|"medium"|"high", suggestion: string, confidence: 0.0-1.0}}
 3. scores: {{overall: 0-100, readability: 0-100, relevance: 0-100, engagement: 0-100, seo: 0-100}}
 
-Focus on actionable improvements.""",
+Focus on actionable improvements.
 
-            "score_content": """Score this content:
+Current draft: "{draft}"
+Context: "{cursor_context}"
+Profile: {user_profile}""",
 
-Content: "{content}"
-Profile: {user_profile}
+            "score_content": """Score the content below.
 
 Return JSON with:
 1. overall_score: 0-100
 2. breakdown: {{keyword_relevance: 0-100, readability: 0-100, user_alignment: 0-100, structure: 0-100, seo: 0-100, engagement: 0-100}}
 3. recommendations: Array of max 5 specific actionable strings
 
-Be precise with scores 0-100."""
+Be precise with scores 0-100.
+
+Content: "{content}"
+Profile: {user_profile}""",
+
+            "recommend_keywords_batch": """Recommend keywords and improvements for each of the {count} drafts below, all by the same author.
+
+Return a JSON array with exactly one object per draft, in the same order. Each object has:
+1. keywords: Array of max 10 {{keyword: string, relevance: 0.0-1.0, context: string, position: integer, similarity: 0.0-1.0}}
+2. weak_sections: Array {{start: int, end: int, issue: string, severity: "low"|"medium"|"high", suggestion: string, confidence: 0.0-1.0}}
+3. scores: {{overall: 0-100, readability: 0-100, relevance: 0-100, engagement: 0-100, seo: 0-100}}
+
+Focus on actionable improvements.
+
+Profile: {user_profile}
+
+{drafts}"""
+        }
+        
+        # Token counts of the templates alone, filled once the tokenizer is loaded
+        self.prompt_base_tokens: Dict[str, int] = {}
+        
+        # One keyword recommendation per draft, for batched autosuggest requests
+        self.response_schemas["keyword_recommendations_batch"] = {
+            "type": "array",
+            "items": self.response_schemas["keyword_recommendations"]
+        }
+        
+        # Generation configs are fixed per schema, so build them once
+        self.generation_configs = {
+            schema_key: genai.types.GenerationConfig(
+                temperature=self.temperature,
+                top_p=0.9,
+                top_k=40,
+                max_output_tokens=8192 if schema_key == "keyword_recommendations_batch" else 4096,
+                response_mime_type="application/json",
+                response_schema=schema
+            )
+            for schema_key, schema in self.response_schemas.items()
         }
     
     async def initialize(self):
@@ -203,16 +367,23 @@ Be precise with scores 0-100."""
             
             genai.configure(api_key=self.api_key)
             
+            self.safety_settings = {
+                HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+                HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+                HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+                HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+            }
             self.model = genai.GenerativeModel(
                 model_name=self.model_name,
-                safety_settings={
-                    HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-                    HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-                    HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-                    HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-                }
+                safety_settings=self.safety_settings
             )
             self.tokenizer = tiktoken.get_encoding("cl100k_base")
+            self.prompt_base_tokens = {
+                prompt_key: self.count_tokens(template.format_map(_EmptyFields()))
+                for prompt_key, template in self.prompts.items()
+            }
+            
+            await self._warm_up()
             
             logger.info(f"LLM Service initialized with {self.model_name}")
             
@@ -220,167 +391,153 @@ Be precise with scores 0-100."""
             logger.error(f"Failed to initialize LLM service: {str(e)}")
             raise
     
+    async def _warm_up(self):
+        """Open the API connection ahead of the first user request (best effort)"""
+        try:
+            # count_tokens is free and sets up the same async channel generation uses
+            await asyncio.wait_for(self.model.count_tokens_async("warm up"), timeout=5.0)
+        except Exception as e:
+            logger.warning(f"LLM connection warm-up failed: {str(e)}")
+    
     def _optimize_content_length(self, content: str, max_tokens: int = 1500) -> str:
         """Optimize content length to prevent token overflow"""
         if not content:
             return content
-            
-        current_tokens = self.count_tokens(content)
-        if current_tokens <= max_tokens:
+        
+        # A token spans at least one UTF-8 byte, so short content fits without encoding
+        if len(content.encode()) <= max_tokens:
             return content
-    
-        char_per_token = len(content) / current_tokens
-        target_chars = int(max_tokens * char_per_token * 0.9) 
-
-        if len(content) > target_chars:
-            truncated = content[:target_chars]
-            last_space = truncated.rfind(' ')
-            if last_space > target_chars * 0.8:  
-                content = truncated[:last_space] + "..."
-            else:
-                content = truncated + "..."
+            
+        if self.tokenizer is None:
+            current_tokens = self.count_tokens(content)
+            if current_tokens <= max_tokens:
+                return content
+            truncated = content[:int(max_tokens * len(content) / current_tokens * 0.9)]
+        else:
+            # Cut the token list itself so the result is capped exactly, without re-encoding
+            token_ids = self.tokenizer.encode(content)
+            if len(token_ids) <= max_tokens:
+                return content
+            truncated = self.tokenizer.decode(token_ids[:int(max_tokens * 0.9)])
         
-        return content
+        last_space = truncated.rfind(' ')
+        if last_space > len(truncated) * 0.8:
+            return truncated[:last_space] + "..."
+        return truncated + "..."
     
-    def count_tokens(self, text: str) -> int:
-        """Count tokens in text"""
+    def count_tokens(self, text: str, cache: bool = True) -> int:
+        """Count tokens in text; pass cache=False for texts counted only once, like completions"""
         if self.tokenizer:
-            return len(self.tokenizer.encode(text))
+            if not cache:
+                return len(self.tokenizer.encode(text))
+            key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+            count = self.token_counts.get(key)
+            if count is None:
+                count = len(self.tokenizer.encode(text))
+                self.token_counts.set(key, count)
+            return count
         return len(text.split()) * 1.3  
     
-    def _fix_truncated_json(self, text: str) -> str:
-        """Fix truncated JSON by adding missing closing braces/brackets"""
-        if not text.strip():
-            return text
-        
-        try:
-            json.loads(text)
-            return text
-        except json.JSONDecodeError:
-            pass
-        
-        open_braces = text.count('{')
-        close_braces = text.count('}')
-        open_brackets = text.count('[')
-        close_brackets = text.count(']')
-        
-
-        fixed_text = text
-        if open_braces > close_braces:
-            fixed_text += '}' * (open_braces - close_braces)
-        if open_brackets > close_brackets:
-            fixed_text += ']' * (open_brackets - close_brackets)
-        
-        # Try to remove trailing comma if present
-        fixed_text = fixed_text.rstrip().rstrip(',')
-        
-        return fixed_text
+    async def count_tokens_async(self, text: str, cache: bool = True) -> int:
+        """Count tokens, tokenizing long texts in a worker thread"""
+        if self.tokenizer and len(text) > TOKENIZE_OFFLOAD_CHARS:
+            return await asyncio.to_thread(self.count_tokens, text, cache)
+        return self.count_tokens(text, cache)
     
-    def _fix_json_response(self, text: str) -> str:
-        """Fix common JSON formatting issues"""
-        if not text.strip():
-            return text
+    async def _optimize_content_length_async(self, content: str, max_tokens: int = 1500) -> str:
+        """_optimize_content_length, tokenizing long content in a worker thread"""
+        if self.tokenizer and len(content) > TOKENIZE_OFFLOAD_CHARS:
+            return await asyncio.to_thread(self._optimize_content_length, content, max_tokens)
+        return self._optimize_content_length(content, max_tokens)
+    
+    def _prompt_tokens(self, prompt_key: str, *values: str) -> Optional[int]:
+        """Prompt token count from the precounted template plus the interpolated values"""
+        base = self.prompt_base_tokens.get(prompt_key)
+        if base is None:
+            return None
+        return base + sum(self.count_tokens(value) for value in values)
+    
+    def _repair_json(self, text: str) -> str:
+        """
+        Repair truncated or sloppy model JSON in a single pass.
         
-        # Remove any markdown code block markers
+        Strips markdown code fences, drops trailing commas before a closing
+        brace/bracket, and closes an unterminated string plus any containers
+        left open, innermost first.
+        """
         text = text.replace('```json', '').replace('```', '').strip()
+        if not text:
+            return text
         
-        # Fix common issues
-        fixes = [
-            # Remove trailing commas
-            (r',(\s*[}\]])', r'\1'),
-            # Fix unescaped quotes in strings (basic fix)
-            (r'(?<!\\)"(?=[^,}\]]*[,}\]])', r'\\"'),
-        ]
+        out = []
+        closers = []
+        in_string = False
+        escape = False
         
-        import re
-        fixed_text = text
-        for pattern, replacement in fixes:
-            fixed_text = re.sub(pattern, replacement, fixed_text)
+        def drop_trailing_comma():
+            while out and out[-1] in ' \t\r\n':
+                out.pop()
+            if out and out[-1] == ',':
+                out.pop()
         
-        # Try the truncated JSON fix as well
-        fixed_text = self._fix_truncated_json(fixed_text)
+        for char in text:
+            if in_string:
+                out.append(char)
+                if escape:
+                    escape = False
+                elif char == '\\':
+                    escape = True
+                elif char == '"':
+                    in_string = False
+                continue
+            
+            if char == '"':
+                in_string = True
+            elif char == '{':
+                closers.append('}')
+            elif char == '[':
+                closers.append(']')
+            elif char in '}]':
+                drop_trailing_comma()
+                if closers and closers[-1] == char:
+                    closers.pop()
+            out.append(char)
         
-        return fixed_text
+        # Close whatever the truncation left open
+        if in_string:
+            if escape:
+                out.pop()
+            out.append('"')
+        drop_trailing_comma()
+        if out and out[-1] == ':':
+            out.append('null')
+        while closers:
+            drop_trailing_comma()
+            out.append(closers.pop())
+        
+        return ''.join(out)
     
     def _validate_and_sanitize_response(self, response_data: Dict[str, Any], schema_key: str) -> Dict[str, Any]:
         """Validate and sanitize response data to ensure values are within expected ranges"""
+        rules = SANITIZE_RULES.get(schema_key)
+        if rules is None:
+            return response_data
+        
         try:
-            if schema_key == "blog_analysis":
-                # Sanitize sentiment scores
-                if "sentiment" in response_data:
-                    sentiment = response_data["sentiment"]
-                    if "confidence" in sentiment:
-                        sentiment["confidence"] = max(0.0, min(1.0, float(sentiment["confidence"])))
-                    
-                    if "scores" in sentiment:
-                        for score_type in ["positive", "negative", "neutral"]:
-                            if score_type in sentiment["scores"]:
-                                sentiment["scores"][score_type] = max(0.0, min(1.0, float(sentiment["scores"][score_type])))
-                
-                # Sanitize topics and limit to 5 items
-                if "topics" in response_data:
-                    response_data["topics"] = response_data["topics"][:5]  # Limit to 5 items
-                    for topic in response_data["topics"]:
-                        if "relevance" in topic:
-                            topic["relevance"] = max(0.0, min(1.0, float(topic["relevance"])))
-                        if "frequency" in topic:
-                            topic["frequency"] = max(1, int(topic["frequency"]))
-                
-                # Sanitize keywords and limit to 10 items
-                if "keywords" in response_data:
-                    response_data["keywords"] = response_data["keywords"][:10]  # Limit to 10 items
-                    for keyword in response_data["keywords"]:
-                        if "relevance" in keyword:
-                            keyword["relevance"] = max(0.0, min(1.0, float(keyword["relevance"])))
-                        if "similarity" in keyword:
-                            keyword["similarity"] = max(0.0, min(1.0, float(keyword["similarity"])))
-                
-                # Sanitize readability
-                if "readability" in response_data:
-                    response_data["readability"] = max(0, min(100, int(float(response_data["readability"]))))
-            
-            elif schema_key == "keyword_recommendations":
-                # Sanitize keywords and limit to 10 items
-                if "keywords" in response_data:
-                    response_data["keywords"] = response_data["keywords"][:10]  # Limit to 10 items
-                    for keyword in response_data["keywords"]:
-                        if "relevance" in keyword:
-                            keyword["relevance"] = max(0.0, min(1.0, float(keyword["relevance"])))
-                        if "similarity" in keyword:
-                            keyword["similarity"] = max(0.0, min(1.0, float(keyword["similarity"])))
-                        if "position" in keyword:
-                            keyword["position"] = max(0, int(keyword.get("position", 0)))
-                
-                # Sanitize weak sections (no hard limit, but validate data)
-                if "weak_sections" in response_data:
-                    for section in response_data["weak_sections"]:
-                        if "confidence" in section:
-                            section["confidence"] = max(0.0, min(1.0, float(section["confidence"])))
-                        if "start" in section:
-                            section["start"] = max(0, int(section["start"]))
-                        if "end" in section:
-                            section["end"] = max(0, int(section["end"]))
-                
-                # Sanitize scores
-                if "scores" in response_data:
-                    for score_type in ["overall", "readability", "relevance", "engagement", "seo"]:
-                        if score_type in response_data["scores"]:
-                            response_data["scores"][score_type] = max(0, min(100, int(float(response_data["scores"][score_type]))))
-            
-            elif schema_key == "content_scoring":
-                # Sanitize overall score
-                if "overall_score" in response_data:
-                    response_data["overall_score"] = max(0, min(100, int(float(response_data["overall_score"]))))
-                
-                # Sanitize breakdown scores
-                if "breakdown" in response_data:
-                    for score_type in ["keyword_relevance", "readability", "user_alignment", "structure", "seo", "engagement"]:
-                        if score_type in response_data["breakdown"]:
-                            response_data["breakdown"][score_type] = max(0, min(100, int(float(response_data["breakdown"][score_type]))))
-                
-                # Limit recommendations to 5 items
-                if "recommendations" in response_data:
-                    response_data["recommendations"] = response_data["recommendations"][:5]
+            # Limit list lengths first so only kept items are clamped
+            for key, limit in rules["limits"]:
+                if key in response_data:
+                    response_data[key] = response_data[key][:limit]
+            
+            for path, field, low, high, cast in rules["fields"]:
+                for container in _walk(response_data, path):
+                    if field in container:
+                        value = cast(container[field])
+                        if low is not None and value < low:
+                            value = low
+                        if high is not None and value > high:
+                            value = high
+                        container[field] = value
             
             return response_data
             
@@ -388,80 +545,161 @@ Be precise with scores 0-100."""
             logger.warning(f"Error sanitizing response data: {e}")
             return response_data  # Return original if sanitization fails
     
-    async def generate_structured_response(self, prompt: str, schema_key: str) -> tuple[Dict[str, Any], TokenUsage]:
-        """Generate structured response using Gemini's response schema"""
+    def _cached_usage(self, prompt_tokens: int) -> TokenUsage:
+        """Token usage for a response served from cache"""
+        return TokenUsage(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=0,
+            total_tokens=prompt_tokens,
+            cost_estimate=0.0,
+            model_used=self.model_name,
+        )
+    
+    def _cache_key(self, prompt: str, schema_key: str) -> bytes:
+        return hashlib.blake2b(f"{schema_key}\0{prompt}".encode(), digest_size=16).digest()
+    
+    def _store_response(self, cache_key: bytes, response_data: Dict[str, Any]):
+        """Cache a parsed response for identical prompts"""
+        self.response_cache.set(cache_key, copy.deepcopy(response_data))
+    
+    async def _generate(self, model, contents: str, config) -> tuple[str, Any]:
+        """Stream a completion, retrying transient API errors, unless the circuit breaker is open"""
+        return await self.circuit_breaker.call(
+            retry_with_exponential_backoff,
+            self._stream_completion,
+            model,
+            contents,
+            config,
+            max_retries=self.max_retries,
+            base_delay=0.5,
+            max_delay=8.0,
+            retry_exceptions=RETRYABLE_API_ERRORS
+        )
+    
+    async def _stream_completion(self, model, contents: str, config) -> tuple[str, Any]:
+        """
+        Stream a completion within the concurrency limit.
+        
+        Returns the response text and finish reason. The stream is left as
+        soon as the accumulated text parses as JSON, without waiting for the
+        final chunk; the finish reason is None in that case.
+        """
+        async with self.request_semaphore:
+            stream = await model.generate_content_async(contents, generation_config=config, stream=True)
+            parts = []
+            finish_reason = None
+            async for chunk in stream:
+                if not chunk.candidates:
+                    continue
+                candidate = chunk.candidates[0]
+                if candidate.content and candidate.content.parts:
+                    parts.extend([p.text for p in candidate.content.parts])
+                if candidate.finish_reason:
+                    finish_reason = candidate.finish_reason
+                    break
+                
+                # Only attempt a parse when the text could close the top-level value
+                if parts and parts[-1].rstrip().endswith(("}", "]")):
+                    text = "".join(parts)
+                    try:
+                        orjson.loads(text)
+                    except orjson.JSONDecodeError:
+                        continue
+                    return text, None
+            return "".join(parts), finish_reason
+    
+    async def _coalesced_generate(self, cache_key: bytes, model, contents: str, config):
+        """Call the model, sharing one request among concurrent identical prompts"""
+        pending = self.inflight_requests.get(cache_key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._generate(model, contents, config))
+            self.inflight_requests[cache_key] = pending
+            pending.add_done_callback(lambda _: self.inflight_requests.pop(cache_key, None))
+        return await asyncio.shield(pending)
+    
+    async def generate_structured_response(
+        self,
+        prompt: str,
+        schema_key: str,
+        use_cache: bool = True,
+        prompt_tokens: Optional[int] = None
+    ) -> tuple[Dict[str, Any], TokenUsage]:
+        """
+        Generate structured response using Gemini's response schema.
+        
+        A previous response to the identical prompt is returned instead of
+        calling the model. prompt_tokens, if known, saves counting the whole
+        prompt.
+        """
         try:
-            prompt_tokens = self.count_tokens(prompt)
+            if prompt_tokens is None:
+                prompt_tokens = await self.count_tokens_async(prompt)
+            
+            use_cache = use_cache and self.cache_responses
+            cache_key = self._cache_key(prompt, schema_key)
+            if use_cache:
+                cached = self.response_cache.get(cache_key)
+                if cached is not None:
+                    return copy.deepcopy(cached), self._cached_usage(prompt_tokens)
+            
 
-            # Configure generation with response schema - increased token limit
-            config = genai.types.GenerationConfig(
-                temperature=0.1,
-                top_p=0.9,
-                top_k=40,
-                max_output_tokens=4096,  # Increased from 2048
-                response_mime_type="application/json",
-                response_schema=self.response_schemas[schema_key]
-            )
+            config = self.generation_configs[schema_key]
 
-            response = await self.model.generate_content_async(prompt, generation_config=config)
+            if use_cache:
+                response_text, finish_reason = await self._coalesced_generate(cache_key, self.model, prompt, config)
+            else:
+                response_text, finish_reason = await self._generate(self.model, prompt, config)
             
-            # Better handling of response extraction
-            response_text = ""
-            if response.candidates and len(response.candidates) > 0:
-                candidate = response.candidates[0]
-                
-                # Check finish reason
-                if hasattr(candidate, 'finish_reason'):
-                    finish_reason = candidate.finish_reason
-                    logger.info(f"Response finish reason: {finish_reason}")
-                    
-                    # Handle different finish reasons
-                    if finish_reason == 2:  # MAX_TOKENS
-                        logger.warning("Response was truncated due to max tokens limit")
-                    elif finish_reason == 3:  # SAFETY
-                        logger.warning("Response was blocked due to safety filters")
-                        raise ValueError("Response blocked by safety filters")
-                    elif finish_reason == 4:  # RECITATION
-                        logger.warning("Response was blocked due to recitation filters")
-                        raise ValueError("Response blocked by recitation filters")
-                
-                # Extract content even if truncated
-                if candidate.content and candidate.content.parts:
-                    response_text = "".join(
-                        [p.text for p in candidate.content.parts if hasattr(p, "text") and p.text]
-                    )
-                
-                # If we got truncated content, try to make it valid JSON
-                if finish_reason == 2 and response_text:
-                    response_text = self._fix_truncated_json(response_text)
+            logger.info(f"Response finish reason: {finish_reason}")
+            
+            # Handle different finish reasons
+            if finish_reason == 2:  # MAX_TOKENS
+                logger.warning("Response was truncated due to max tokens limit")
+            elif finish_reason == 3:  # SAFETY
+                logger.warning("Response was blocked due to safety filters")
+                raise ValueError("Response blocked by safety filters")
+            elif finish_reason == 4:  # RECITATION
+                logger.warning("Response was blocked due to recitation filters")
+                raise ValueError("Response blocked by recitation filters")
+            
+            # If we got truncated content, try to make it valid JSON
+            if finish_reason == 2 and response_text:
+                response_text = self._repair_json(response_text)
             
             if not response_text:
                 logger.warning(f"No response text extracted, using fallback")
-                raise ValueError(f"Model returned no content. Finish reason: {response.candidates[0].finish_reason if response.candidates else 'Unknown'}")
+                raise ValueError(f"Model returned no content. Finish reason: {finish_reason}")
 
             # Parse JSON response
+            cacheable = True
             try:
-                response_data = json.loads(response_text)
+                response_data = orjson.loads(response_text)
                 # Validate and sanitize the response
                 response_data = self._validate_and_sanitize_response(response_data, schema_key)
-            except json.JSONDecodeError as e:
+            except orjson.JSONDecodeError as e:
                 logger.error(f"Failed to parse JSON response: {e}")
                 logger.error(f"Raw response (first 500 chars): {response_text[:500]}")
                 
                 # Try to fix common JSON issues
-                fixed_text = self._fix_json_response(response_text)
+                fixed_text = self._repair_json(response_text)
                 if fixed_text != response_text:
                     try:
-                        response_data = json.loads(fixed_text)
+                        response_data = orjson.loads(fixed_text)
                         response_data = self._validate_and_sanitize_response(response_data, schema_key)
                         logger.info("Successfully fixed and parsed JSON response")
-                    except json.JSONDecodeError:
+                    except orjson.JSONDecodeError:
                         logger.error("Could not fix JSON response, using fallback")
                         response_data = self._get_fallback_response(schema_key)
+                        cacheable = False
                 else:
                     response_data = self._get_fallback_response(schema_key)
+                    cacheable = False
+            
+            # Fallbacks are never cached, so the next call retries the model
+            if cacheable and use_cache:
+                self._store_response(cache_key, response_data)
 
-            completion_tokens = self.count_tokens(response_text) if response_text else 100
+            completion_tokens = await self.count_tokens_async(response_text, cache=False) if response_text else 100
             total_tokens = prompt_tokens + completion_tokens
             self.total_tokens_used += total_tokens
             
@@ -482,10 +720,12 @@ Be precise with scores 0-100."""
             logger.error(f"Error generating structured response: {str(e)}")
             # Return fallback response instead of raising
             fallback_data = self._get_fallback_response(schema_key)
+            if prompt_tokens is None:
+                prompt_tokens = await self.count_tokens_async(prompt)
             token_usage = TokenUsage(
-                prompt_tokens=self.count_tokens(prompt),
+                prompt_tokens=prompt_tokens,
                 completion_tokens=100,  # Estimate
-                total_tokens=self.count_tokens(prompt) + 100,
+                total_tokens=prompt_tokens + 100,
                 cost_estimate=0.0,
                 model_used=self.model_name,
             )
@@ -495,7 +735,7 @@ Be precise with scores 0-100."""
         """Analyze a single blog post using structured output"""
         try:
         
-            optimized_content = self._optimize_content_length(blog_post.content, max_tokens=1200)
+            optimized_content = await self._optimize_content_length_async(blog_post.content, max_tokens=1200)
             
             prompt = self.prompts["analyze_blog"].format(
                 content=optimized_content
@@ -504,7 +744,8 @@ Be precise with scores 0-100."""
             logger.info(f"Analyzing blog post (original length: {len(blog_post.content)}, optimized: {len(optimized_content)})")
         
             response_data, token_usage = await self.generate_structured_response(
-                prompt, "blog_analysis"
+                prompt, "blog_analysis",
+                prompt_tokens=self._prompt_tokens("analyze_blog", optimized_content)
             )
             
             analysis_result = self._format_analysis_result(response_data, blog_post, token_usage)
@@ -524,10 +765,10 @@ Be precise with scores 0-100."""
     ) -> Dict[str, Any]:
         """Generate keyword recommendations using structured output"""
         try:
-            profile_str = json.dumps(user_profile.dict()) if user_profile else "{}"
+            profile_str = user_profile.to_json() if user_profile else "{}"
             
-            optimized_draft = self._optimize_content_length(draft, max_tokens=800)
-            optimized_context = self._optimize_content_length(cursor_context or "", max_tokens=200)
+            optimized_draft = await self._optimize_content_length_async(draft, max_tokens=800)
+            optimized_context = await self._optimize_content_length_async(cursor_context or "", max_tokens=200)
             
             prompt = self.prompts["recommend_keywords"].format(
                 draft=optimized_draft,
@@ -537,9 +778,28 @@ Be precise with scores 0-100."""
             
             logger.info("Generating keyword recommendations")
             
-            response_data, token_usage = await self.generate_structured_response(
-                prompt, "keyword_recommendations"
-            )
+            # Misses for an author who already has a request in flight wait for a
+            # batch. Anonymous drafts are never batched: they may come from
+            # different people, and the batch prompt presents one author
+            cached = self.cache_responses and self._cache_key(prompt, "keyword_recommendations") in self.response_cache
+            if (self.keyword_batch_window > 0 and user_profile is not None and not cached
+                    and self.keyword_requests_inflight[profile_str]):
+                response_data, token_usage = await self._queue_keyword_request(
+                    profile_str, prompt, optimized_draft, optimized_context
+                )
+            else:
+                self.keyword_requests_inflight[profile_str] += 1
+                try:
+                    response_data, token_usage = await self.generate_structured_response(
+                        prompt, "keyword_recommendations",
+                        prompt_tokens=self._prompt_tokens(
+                            "recommend_keywords", optimized_draft, optimized_context, profile_str
+                        )
+                    )
+                finally:
+                    self.keyword_requests_inflight[profile_str] -= 1
+                    if not self.keyword_requests_inflight[profile_str]:
+                        del self.keyword_requests_inflight[profile_str]
             
        
             formatted_result = self._format_keyword_result(response_data, token_usage)
@@ -551,6 +811,123 @@ Be precise with scores 0-100."""
             logger.error(f"Error generating keyword recommendations: {str(e)}")
             raise
     
+    async def _queue_keyword_request(
+        self,
+        profile_str: str,
+        prompt: str,
+        draft: str,
+        context: str
+    ) -> tuple[Dict[str, Any], TokenUsage]:
+        """Add a keyword request to the pending batch for its profile and wait for the result"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        
+        batch = self.keyword_batches.get(profile_str)
+        if batch is None:
+            timer = loop.call_later(self.keyword_batch_window, self._flush_keyword_batch, profile_str)
+            batch = self.keyword_batches[profile_str] = ([], timer)
+        batch[0].append((prompt, draft, context, future))
+        if len(batch[0]) >= self.keyword_batch_size:
+            self._flush_keyword_batch(profile_str)
+        
+        return await future
+    
+    def _flush_keyword_batch(self, profile_str: str):
+        batch = self.keyword_batches.pop(profile_str, None)
+        if batch is not None:
+            requests, timer = batch
+            timer.cancel()
+            task = asyncio.ensure_future(self._run_keyword_batch(profile_str, requests))
+            self.keyword_batch_tasks.add(task)
+            task.add_done_callback(self.keyword_batch_tasks.discard)
+    
+    async def _run_keyword_batch(self, profile_str: str, requests: List[tuple]):
+        """Answer a batch of keyword requests, with one model call when it holds several drafts"""
+        # Identical requests share one slot in the batch
+        groups: Dict[str, tuple] = {}
+        for prompt, draft, context, future in requests:
+            groups.setdefault(prompt, (draft, context, []))[2].append(future)
+        
+        try:
+            results = None
+            if len(groups) > 1:
+                results = await self._recommend_keywords_multi(
+                    [(draft, context) for draft, context, _ in groups.values()], profile_str
+                )
+                if results is not None and self.cache_responses:
+                    for prompt, (response_data, _) in zip(groups, results):
+                        self._store_response(self._cache_key(prompt, "keyword_recommendations"), response_data)
+            if results is None:
+                results = await asyncio.gather(*(
+                    self.generate_structured_response(
+                        prompt, "keyword_recommendations",
+                        prompt_tokens=self._prompt_tokens("recommend_keywords", draft, context, profile_str)
+                    )
+                    for prompt, (draft, context, _) in groups.items()
+                ))
+            
+            for (_, _, futures), (response_data, token_usage) in zip(groups.values(), results):
+                for future in futures:
+                    if not future.done():
+                        future.set_result((copy.deepcopy(response_data), token_usage))
+        except Exception as e:
+            for _, _, futures in groups.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+    
+    async def _recommend_keywords_multi(
+        self,
+        drafts_and_contexts: List[tuple],
+        profile_str: str
+    ) -> Optional[List[tuple]]:
+        """
+        Recommend keywords for several drafts of one author with a single prompt.
+        
+        The instructions and profile are sent once for all drafts. Returns a
+        (response, token usage) pair per draft, or None if the batched reply
+        is unusable and the drafts should be sent separately.
+        """
+        drafts = "\n\n".join(
+            f'Draft {i}: "{draft}"\nContext: "{context}"'
+            for i, (draft, context) in enumerate(drafts_and_contexts, 1)
+        )
+        prompt = self.prompts["recommend_keywords_batch"].format(
+            count=len(drafts_and_contexts), user_profile=profile_str, drafts=drafts
+        )
+        
+        try:
+            response_text, _ = await self._generate(
+                self.model, prompt, self.generation_configs["keyword_recommendations_batch"]
+            )
+            results = orjson.loads(response_text)
+        except Exception as e:
+            logger.warning(f"Batched keyword recommendations failed, sending drafts separately: {str(e)}")
+            return None
+        
+        if (not isinstance(results, list) or len(results) != len(drafts_and_contexts)
+                or not all(isinstance(result, dict) for result in results)):
+            logger.warning("Batched keyword recommendations did not match the drafts, sending them separately")
+            return None
+        
+        prompt_tokens = await self.count_tokens_async(prompt)
+        completion_tokens = await self.count_tokens_async(response_text, cache=False)
+        self.total_tokens_used += prompt_tokens + completion_tokens
+        
+        # Each draft is charged an equal share of the batched call
+        count = len(results)
+        token_usage = TokenUsage(
+            prompt_tokens=int(prompt_tokens / count),
+            completion_tokens=int(completion_tokens / count),
+            total_tokens=int((prompt_tokens + completion_tokens) / count),
+            cost_estimate=((prompt_tokens / 1000000 * 0.125) + (completion_tokens / 1000000 * 0.375)) / count,
+            model_used=self.model_name,
+        )
+        return [
+            (self._validate_and_sanitize_response(result, "keyword_recommendations"), token_usage)
+            for result in results
+        ]
+    
     async def score_content(
         self, 
         content: str, 
@@ -558,9 +935,9 @@ Be precise with scores 0-100."""
     ) -> Dict[str, Any]:
         """Score content using structured output"""
         try:
-            profile_str = json.dumps(user_profile.dict()) if user_profile else "{}"
+            profile_str = user_profile.to_json() if user_profile else "{}"
             
-            optimized_content = self._optimize_content_length(content, max_tokens=1000)
+            optimized_content = await self._optimize_content_length_async(content, max_tokens=1000)
             
             prompt = self.prompts["score_content"].format(
                 content=optimized_content,
@@ -570,10 +947,11 @@ Be precise with scores 0-100."""
             logger.info("Scoring content")
             
             response_data, token_usage = await self.generate_structured_response(
-                prompt, "content_scoring"
+                prompt, "content_scoring",
+                prompt_tokens=self._prompt_tokens("score_content", optimized_content, profile_str)
             )
             
-            response_data["token_usage"] = token_usage.dict()
+            response_data["token_usage"] = token_usage.model_dump()
             
             logger.info(f"Content scoring completed. Score: {response_data.get('overall_score', 0)}")
             return response_data
@@ -582,6 +960,16 @@ Be precise with scores 0-100."""
             logger.error(f"Error scoring content: {str(e)}")
             raise
     
+    async def score_content_batch(
+        self,
+        contents: List[str],
+        user_profile: Optional[UserProfile] = None
+    ) -> List[Dict[str, Any]]:
+        """Score several contents concurrently; identical ones share a model call"""
+        return list(await asyncio.gather(
+            *(self.score_content(content, user_profile) for content in contents)
+        ))
+    
     def _format_analysis_result(self, result: Dict, blog_post: BlogPost, token_usage: TokenUsage) -> Dict[str, Any]:
         """Format analysis result to match expected structure"""
         sentiment_data = result.get("sentiment", {})
@@ -594,27 +982,27 @@ Be precise with scores 0-100."""
                 negative_score=sentiment_data.get("scores", {}).get("negative", 0.0),
                 neutral_score=sentiment_data.get("scores", {}).get("neutral", 1.0)
             ),
-            "key_topics": [
-                KeyTopic(
-                    topic=topic["topic"],
-                    relevance_score=topic["relevance"],
-                    frequency=topic["frequency"]
-                )
+            "key_topics": _TOPICS_ADAPTER.validate_python([
+                {
+                    "topic": topic["topic"],
+                    "relevance_score": topic["relevance"],
+                    "frequency": topic["frequency"]
+                }
                 for topic in result.get("topics", [])
-            ],
-            "keyword_suggestions": [
-                KeywordSuggestion(
-                    keyword=kw["keyword"],
-                    relevance_score=kw["relevance"],
-                    context=kw["context"],
-                    semantic_similarity=kw["similarity"]
-                )
+            ]),
+            "keyword_suggestions": _KEYWORDS_ADAPTER.validate_python([
+                {
+                    "keyword": kw["keyword"],
+                    "relevance_score": kw["relevance"],
+                    "context": kw["context"],
+                    "semantic_similarity": kw["similarity"]
+                }
                 for kw in result.get("keywords", [])
-            ],
+            ]),
             "readability_score": result.get("readability", 50),
             "word_count": len(blog_post.content.split()),
             "estimated_reading_time": max(1, len(blog_post.content.split()) // 200),
-            "token_usage": token_usage.dict()
+            "token_usage": token_usage.model_dump()
         }
     
     def _format_keyword_result(self, result: Dict, token_usage: TokenUsage) -> Dict[str, Any]:  
@@ -646,19 +1034,19 @@ Be precise with scores 0-100."""
             formatted_weak_sections.append(formatted_section)
 
         return {
-            "keywords": [
-                KeywordSuggestion(
-                    keyword=kw["keyword"],
-                    relevance_score=kw["relevance"],
-                    context=kw["context"],
-                    position_suggestion=kw.get("position"),
-                    semantic_similarity=kw["similarity"]
-                )
-               for kw in result.get("keywords", [])
-            ],
+            "keywords": _KEYWORDS_ADAPTER.validate_python([
+                {
+                    "keyword": kw["keyword"],
+                    "relevance_score": kw["relevance"],
+                    "context": kw["context"],
+                    "position_suggestion": kw.get("position"),
+                    "semantic_similarity": kw["similarity"]
+                }
+                for kw in result.get("keywords", [])
+            ]),
             "weak_sections": formatted_weak_sections, 
             "realtime_score": formatted_scores,  
-            "token_usage": token_usage.dict(),
+            "token_usage": token_usage.model_dump(),
             "suggestions_context": "Real-time analysis based on current draft"
         }  
         
@@ -697,13 +1085,14 @@ Be precise with scores 0-100."""
             if not self.model:
                 return {"status": "unhealthy", "reason": "Model not initialized"}
          
-            test_response, _ = await self.generate_structured_response(
-                "Test prompt for health check", "content_scoring"
-            )
+            # Availability only: count_tokens reaches the model API without
+            # generating anything, so probes cost no tokens
+            await asyncio.wait_for(self.model.count_tokens_async("ping"), timeout=5.0)
             
             return {
                 "status": "healthy",
                 "model": self.model_name,
+                "circuit_breaker": self.circuit_breaker.state,
                 "total_tokens_used": self.total_tokens_used,
                 "last_check": datetime.utcnow().isoformat()
             }
@@ -0,0 +1,73 @@
+import asyncio
+
+import orjson
+
+from models import BlogPost
+from services.llm_service import LLMService
+
+GREAT_POST = (
+    "Python is a great language for data science. Its libraries are the best choice "
+    "for analysis, and the community makes learning it easy for every beginner."
+)
+POOR_POST = (
+    "Python is a poor language for data science. Its libraries are the worst choice "
+    "for analysis, and the Julia community makes learning it easy for every beginner."
+)
+
+
+def analysis_reply(sentiment):
+    return orjson.dumps({
+        "sentiment": {"type": sentiment, "confidence": 0.9,
+                      "scores": {"positive": 0.5, "negative": 0.5, "neutral": 0.0}},
+        "topics": [{"topic": "python", "relevance": 0.9, "frequency": 2}],
+        "keywords": [{"keyword": "python", "relevance": 0.9, "context": "intro", "similarity": 0.8}],
+        "readability": 60
+    }).decode()
+
+
+class WordTokenizer:
+    """Stands in for tiktoken, which initialize() would download"""
+
+    def encode(self, text):
+        return text.split()
+
+
+def make_service(monkeypatch, replies):
+    service = LLMService()
+    service.model_name = "test-model"
+    service.tokenizer = WordTokenizer()
+    calls = []
+
+    async def fake_generate(model, contents, config):
+        calls.append(contents)
+        return replies[len(calls) - 1], 1
+
+    monkeypatch.setattr(service, "_generate", fake_generate)
+    return service, calls
+
+
+def analyze(service, content):
+    post = BlogPost(title="Python", content=content, author="Writer")
+    return asyncio.run(service.analyze_blog_post(post))
+
+
+def test_differently_worded_posts_are_not_served_from_cache(monkeypatch):
+    service, calls = make_service(monkeypatch, [analysis_reply("positive"), analysis_reply("negative")])
+
+    great = analyze(service, GREAT_POST)
+    poor = analyze(service, POOR_POST)
+
+    assert len(calls) == 2
+    assert great["sentiment"].sentiment.value == "positive"
+    assert poor["sentiment"].sentiment.value == "negative"
+
+
+def test_identical_post_is_served_from_cache(monkeypatch):
+    service, calls = make_service(monkeypatch, [analysis_reply("positive")])
+
+    first = analyze(service, GREAT_POST)
+    second = analyze(service, GREAT_POST)
+
+    assert len(calls) == 1
+    assert second["sentiment"] == first["sentiment"]
+    assert second["token_usage"]["completion_tokens"] == 0
@@ -0,0 +1,62 @@
+import asyncio
+import threading
+
+from models import UserProfile
+from services.scoring_service import BlogScoringService
+
+CONTENTS = [
+    "Python makes data science simple. Share your thoughts in the comments!",
+    "A short guide.\n\nLearn the basics of web development step by step.",
+    "Python makes data science simple. Share your thoughts in the comments!",
+]
+PROFILE = UserProfile(user_id="u1", preferred_topics=["python"], writing_style="casual")
+
+
+def without_timestamp(result):
+    return {key: value for key, value in result.items() if key != "analysis_timestamp"}
+
+
+def test_inline_batch_matches_single_scores_off_the_event_loop(monkeypatch):
+    service = BlogScoringService()
+    calls = []
+    score = service._calculate_comprehensive_score
+
+    def recording_score(content, user_profile=None):
+        calls.append((content, threading.get_ident()))
+        return score(content, user_profile)
+
+    monkeypatch.setattr(service, "_calculate_comprehensive_score", recording_score)
+
+    async def run():
+        loop_thread = threading.get_ident()
+        batch = await service.score_batch(CONTENTS, [PROFILE] * len(CONTENTS))
+        return loop_thread, batch
+
+    loop_thread, batch = asyncio.run(run())
+
+    # Repeated content is scored once, and never on the event loop thread
+    assert [content for content, _ in calls] == CONTENTS[:2]
+    assert all(thread != loop_thread for _, thread in calls)
+
+    expected = [without_timestamp(score(content, PROFILE)) for content in CONTENTS]
+    assert [without_timestamp(result) for result in batch] == expected
+
+
+def test_batch_shares_score_cache_with_single_scoring(monkeypatch):
+    service = BlogScoringService()
+    single = asyncio.run(service.calculate_comprehensive_score(CONTENTS[0], PROFILE))
+
+    def fail(content, user_profile=None):
+        raise AssertionError(f"scored again: {content!r}")
+
+    batch = asyncio.run(service.score_batch(CONTENTS[1:2], [PROFILE]))
+    monkeypatch.setattr(service, "_calculate_comprehensive_score", fail)
+
+    cached = asyncio.run(service.score_batch(CONTENTS, [PROFILE] * len(CONTENTS)))
+    assert without_timestamp(cached[0]) == without_timestamp(single)
+    assert without_timestamp(cached[1]) == without_timestamp(batch[0])
+
+    # Results are copies, so callers cannot change the cached entry
+    cached[0]["recommendations"].append("changed")
+    again = asyncio.run(service.calculate_comprehensive_score(CONTENTS[0], PROFILE))
+    assert "changed" not in again["recommendations"]
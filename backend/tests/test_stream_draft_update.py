@@ -0,0 +1,61 @@
+import asyncio
+
+import orjson
+
+import main
+from models import KeywordSuggestion, UserProfile
+from services.agent_service import AgentOrchestrator
+
+
+class StubLLMService:
+    """Returns keyword recommendations shaped like LLMService's, models included"""
+
+    async def recommend_keywords(self, current_draft, cursor_context=None, user_profile=None):
+        return {
+            "keywords": [
+                KeywordSuggestion(
+                    keyword="clear writing",
+                    relevance_score=0.8,
+                    context="style",
+                    position_suggestion=4,
+                    semantic_similarity=0.7
+                )
+            ],
+            "weak_sections": [],
+            "realtime_score": {"overall_score": 70},
+            "token_usage": {},
+            "suggestions_context": "stub"
+        }
+
+
+class StubScoringService:
+    async def calculate_comprehensive_score(self, content, user_profile=None):
+        return {"breakdown": {"readability": 50, "seo": 80}}
+
+
+async def read_stream(orchestrator, draft_text):
+    session_id = await orchestrator.start_session(UserProfile(user_id="u1", name="Writer"))
+    response = await main.stream_draft_update(session_id, draft_text, 0)
+    lines = [line async for line in response.body_iterator]
+    return session_id, [orjson.loads(line) for line in lines]
+
+
+def test_stream_serializes_every_stage(monkeypatch):
+    orchestrator = AgentOrchestrator(StubLLMService(), StubScoringService())
+    monkeypatch.setattr(main, "agent_orchestrator", orchestrator)
+
+    session_id, updates = asyncio.run(read_stream(orchestrator, "Short. This draft is long enough to analyze."))
+
+    stages = [update["stage"] for update in updates]
+    assert "error" not in stages
+    assert stages[-1] == "finalize_response"
+    assert {"generate_keywords", "refine_suggestions"} <= set(stages)
+
+    final = updates[-1]
+    assert final["keywords"][0]["keyword"] == "clear writing"
+    assert final["weak_sections"][0]["issue_type"] == "sentence_too_short"
+
+    # The completed stream is recorded on the session
+    session = orchestrator.active_sessions.get(session_id)
+    assert session.suggestion_count == 1
+    assert orchestrator.last_analyzed_drafts[session_id] == "Short. This draft is long enough to analyze."
@@ -1,55 +1,108 @@
 import os
+import hmac
+import time
+import hashlib
 import jwt
+import orjson
 import logging
-from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Any, Iterable, Mapping, Optional
 from fastapi import HTTPException
 
+from utils.cache import TTLCache
+
 logger = logging.getLogger(__name__)
 
+# Recently verified JWTs, keyed by a digest of the token, so repeat requests
+# skip signature verification
+_verified_tokens = TTLCache(
+    maxsize=int(os.getenv("AUTH_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("AUTH_CACHE_TTL", "30"))
+)
+
+# Recently rejected JWTs and the reason, kept briefly so a client retrying a
+# bad token in a loop does not cost a decode per request
+_rejected_tokens = TTLCache(
+    maxsize=int(os.getenv("AUTH_NEGATIVE_CACHE_SIZE", "5000")),
+    ttl=float(os.getenv("AUTH_NEGATIVE_CACHE_TTL", "5"))
+)
+
+@dataclass(frozen=True, slots=True)
+class AuthConfig:
+    """Auth secrets, read from the environment once by init_auth()"""
+    api_key_bytes: bytes
+    jwt_secret: str
+
+_config: Optional[AuthConfig] = None
+
+# Result for API-key callers, shared by every request. Read-only: callers
+# that need to modify a verify_token result must copy it first.
+_API_KEY_RESULT: Mapping[str, Any] = MappingProxyType({
+    "valid": True,
+    "type": "api_key",
+    "user_id": "api_user",
+    "permissions": ("read", "write", "analyze")
+})
+
 class AuthenticationError(Exception):
     """Custom authentication error"""
     pass
 
-async def verify_token(token: str) -> Dict[str, Any]:
+def verify_token(token: str) -> Mapping[str, Any]:
     """
     Verify JWT token or API key
     
     Supports both:
     1. JWT tokens for user authentication
     2. API keys for service-to-service communication
+    
+    Results are shared between requests and must not be modified.
     """
     try:
+        config = _config or init_auth()
+        
         # Check if it's an API key first
-        api_key = os.getenv("API_KEY", "MOCK_API_KEY")
-        if token == api_key:
-            return {
-                "valid": True,
-                "type": "api_key",
-                "user_id": "api_user",
-                "permissions": ["read", "write", "analyze"]
-            }
+        token_bytes = token.encode()
+        if hmac.compare_digest(token_bytes, config.api_key_bytes):
+            return _API_KEY_RESULT
         
-        # Try JWT token verification
-        jwt_secret = os.getenv("JWT_SECRET", "your-jwt-secret-here")
+        cache_key = hashlib.blake2b(token_bytes, digest_size=16).digest()
+        cached = _verified_tokens.get(cache_key)
+        if cached is not None:
+            if time.time() <= cached["payload"]["exp"]:
+                return cached
+            _verified_tokens.pop(cache_key)
+            raise AuthenticationError("Token has expired")
+        
+        rejection = _rejected_tokens.get(cache_key)
+        if rejection is not None:
+            raise AuthenticationError(rejection)
         
+        # Try JWT token verification
         try:
-            payload = jwt.decode(token, jwt_secret, algorithms=["HS256"])
-            
-           
-            if payload.get("exp") and datetime.utcnow().timestamp() > payload["exp"]:
-                raise AuthenticationError("Token has expired")
+            # PyJWT checks the signature and expiry in one pass
+            payload = jwt.decode(
+                token, config.jwt_secret, algorithms=["HS256"],
+                options={"require": ["exp"], "verify_exp": True}, leeway=0
+            )
             
-            return {
+            result = {
                 "valid": True,
                 "type": "jwt",
                 "user_id": payload.get("user_id", "unknown"),
-                "permissions": payload.get("permissions", ["read"]),
+                "permissions": payload.get("permissions", ("read",)),
                 "payload": payload
             }
+            _verified_tokens.set(cache_key, result)
+            return result
             
+        except jwt.ExpiredSignatureError:
+            rejection = "Token has expired"
         except jwt.InvalidTokenError as e:
-            raise AuthenticationError(f"Invalid JWT token: {str(e)}")
+            rejection = f"Invalid JWT token: {str(e)}"
+        _rejected_tokens.set(cache_key, rejection)
+        raise AuthenticationError(rejection)
     
     except AuthenticationError:
         raise
@@ -57,21 +110,78 @@ async def verify_token(token: str) -> Dict[str, Any]:
         logger.error(f"Authentication error: {str(e)}")
         raise AuthenticationError("Authentication failed")
 
-def generate_jwt_token(user_id: str, permissions: list = None, expires_in_hours: int = 24) -> str:
-    """Generate a JWT token for testing purposes"""
-    if permissions is None:
-        permissions = ["read", "write"]
+class AuthASGIMiddleware:
+    """
+    Pure ASGI middleware that authenticates bearer tokens for protected paths.
     
-    jwt_secret = os.getenv("JWT_SECRET", "your-jwt-secret-here")
+    Reads the Authorization header straight from the ASGI scope and runs
+    verify_token, so endpoints need no per-request security dependency.
+    The verified result is available as request.state.user; failures are
+    answered with 401 without reaching the application.
+    """
+    
+    def __init__(self, app, protected_prefix: str = "/api/", exempt_paths: Iterable[str] = ()):
+        self.app = app
+        self.protected_prefix = protected_prefix
+        self.exempt_paths = frozenset(exempt_paths)
+    
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "OPTIONS"
+            or not scope["path"].startswith(self.protected_prefix)
+            or scope["path"] in self.exempt_paths
+        ):
+            await self.app(scope, receive, send)
+            return
+        
+        token = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                scheme, _, credentials = value.decode("latin-1").partition(" ")
+                if scheme.lower() == "bearer" and credentials:
+                    token = credentials.strip()
+                break
+        
+        if token is None:
+            await self._reject(send, "Not authenticated")
+            return
+        
+        try:
+            user = verify_token(token)
+        except AuthenticationError as e:
+            await self._reject(send, str(e))
+            return
+        
+        scope.setdefault("state", {})["user"] = user
+        await self.app(scope, receive, send)
     
+    @staticmethod
+    async def _reject(send, detail: str):
+        body = orjson.dumps({"detail": detail})
+        await send({
+            "type": "http.response.start",
+            "status": 401,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"www-authenticate", b"Bearer")
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
+
+def generate_jwt_token(user_id: str, permissions: Iterable[str] = ("read", "write"), expires_in_hours: int = 24) -> str:
+    """Generate a JWT token for testing purposes"""
+
+    now = int(time.time())
     payload = {
         "user_id": user_id,
-        "permissions": permissions,
-        "iat": datetime.utcnow(),
-        "exp": datetime.utcnow() + timedelta(hours=expires_in_hours)
+        "permissions": list(permissions),
+        "iat": now,
+        "exp": now + expires_in_hours * 3600
     }
     
-    token = jwt.encode(payload, jwt_secret, algorithm="HS256")
+    token = jwt.encode(payload, (_config or init_auth()).jwt_secret, algorithm="HS256")
     return token
 
 def create_test_api_key() -> str:
@@ -88,4 +198,27 @@ def setup_auth_environment():
         os.environ["JWT_SECRET"] = "dev-jwt-secret-blog-agent-system"
         logger.info("Set development JWT secret")
 
-setup_auth_environment()
\ No newline at end of file
+def init_auth() -> AuthConfig:
+    """
+    Read API_KEY and JWT_SECRET into the auth config.
+    
+    Called at app startup, after .env is loaded; verify_token falls back to
+    calling it on first use. Calling it again picks up rotated secrets and
+    drops tokens verified under the old ones.
+    """
+    global _config
+    setup_auth_environment()
+    _config = AuthConfig(
+        api_key_bytes=os.environ["API_KEY"].encode(),
+        jwt_secret=os.environ["JWT_SECRET"]
+    )
+    _verified_tokens.clear()
+    _rejected_tokens.clear()
+    return _config
+
+def auth_cache_stats() -> Dict[str, Dict[str, Optional[float]]]:
+    """Token cache statistics; a busy rejected cache suggests a client hammering with bad tokens"""
+    return {
+        "verified": _verified_tokens.stats(),
+        "rejected": _rejected_tokens.stats()
+    }
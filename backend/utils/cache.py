@@ -0,0 +1,180 @@
+import asyncio
+import math
+import re
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+class TTLCache:
+    """
+    Size-bounded LRU cache whose entries expire after a fixed time-to-live.
+
+    Used to serve repeated LLM requests locally. get_or_compute() is
+    single-flight: concurrent misses on the same key share one computation.
+    on_evict, if given, is called with (key, value) for entries dropped by
+    expiry or by the size bound, but not for explicit pop().
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 60.0,
+        on_evict: Optional[Callable[[Hashable, Any], None]] = None
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired"""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self._evicted(key, value)
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full"""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            evicted_key, (_, evicted_value) = self._data.popitem(last=False)
+            self._evicted(evicted_key, evicted_value)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove a key and return its value"""
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        self._data.clear()
+
+    def expire(self) -> int:
+        """Drop all expired entries and return how many were removed"""
+        now = time.monotonic()
+        expired = [key for key, (expires_at, _) in self._data.items() if expires_at < now]
+        for key in expired:
+            _, value = self._data.pop(key)
+            self._evicted(key, value)
+        return len(expired)
+
+    def _evicted(self, key: Hashable, value: Any) -> None:
+        if self.on_evict is not None:
+            self.on_evict(key, value)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Whether key holds an unexpired entry; does not count as a lookup"""
+        entry = self._data.get(key)
+        return entry is not None and entry[0] >= time.monotonic()
+    
+    def __len__(self) -> int:
+        return len(self._data)
+
+    async def get_or_compute(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for key, computing it once on a miss"""
+        _missing = object()
+        value = self.get(key, _missing)
+        if value is not _missing:
+            return value
+
+        # Join a computation that is already running for this key
+        future = self._inflight.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        future = asyncio.ensure_future(factory())
+        self._inflight[key] = future
+        try:
+            value = await asyncio.shield(future)
+            self.set(key, value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        """Cache statistics for status endpoints"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else None
+        }
+
+
+class SimilarityIndex:
+    """
+    Bounded LRU index of term-frequency vectors for near-duplicate lookup.
+
+    Lets a cache serve a draft that differs from an earlier one by a few
+    keystrokes. Entries are grouped by scope so only comparable inputs
+    (e.g. the same user profile) are ever matched. Term frequencies ignore
+    order, so texts whose lengths differ by more than min_length_ratio are
+    never treated as near duplicates.
+    """
+
+    _token_pattern = re.compile(r'\w+')
+
+    def __init__(self, maxsize: int = 512, threshold: float = 0.97, min_length_ratio: float = 0.95):
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self.min_length_ratio = min_length_ratio
+        self._entries: "OrderedDict[Hashable, tuple[Hashable, Counter, float, int]]" = OrderedDict()
+
+    def _vectorize(self, text: str) -> "tuple[Counter, float]":
+        vector = Counter(self._token_pattern.findall(text.lower()))
+        norm = math.sqrt(sum(count * count for count in vector.values()))
+        return vector, norm
+
+    def add(self, key: Hashable, scope: Hashable, text: str) -> None:
+        """Index text under key, evicting the least recently added entry when full"""
+        vector, norm = self._vectorize(text)
+        if not norm:
+            return
+        self._entries[key] = (scope, vector, norm, len(text))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def nearest(self, scope: Hashable, text: str, threshold: Optional[float] = None) -> Optional[Hashable]:
+        """Return the key of the most similar text in scope at or above the threshold"""
+        vector, norm = self._vectorize(text)
+        if not norm:
+            return None
+
+        length = len(text)
+        best_key, best_similarity = None, self.threshold if threshold is None else threshold
+        for key, (entry_scope, entry_vector, entry_norm, entry_length) in self._entries.items():
+            if entry_scope != scope:
+                continue
+            if min(length, entry_length) < self.min_length_ratio * max(length, entry_length):
+                continue
+            small, large = (vector, entry_vector) if len(vector) <= len(entry_vector) else (entry_vector, vector)
+            dot = sum(count * large[token] for token, count in small.items() if token in large)
+            similarity = dot / (norm * entry_norm)
+            if similarity >= best_similarity:
+                best_key, best_similarity = key, similarity
+        return best_key
+
+    def discard(self, key: Hashable) -> None:
+        """Remove a key from the index"""
+        self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
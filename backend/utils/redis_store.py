@@ -0,0 +1,76 @@
+import os
+import logging
+from typing import Any, Dict, List, Optional
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+def _default(obj: Any) -> Any:
+    """Serialize pydantic models nested in LLM results"""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+class RedisStore:
+    """
+    Shared second-level store for agent state that should outlive a worker.
+
+    Historical analysis patterns are kept as capped Redis lists and cached
+    LLM results as JSON strings with a TTL, so every worker process reuses
+    them and a restart does not start cold. In-process caches stay in front
+    of this store as the first level.
+    """
+
+    def __init__(self, client, prefix: str = "blog-agent", pattern_limit: int = 100):
+        self.client = client
+        self.prefix = prefix
+        self.pattern_limit = pattern_limit
+
+    @classmethod
+    def from_env(cls, pattern_limit: int = 100) -> Optional["RedisStore"]:
+        """Create a store from REDIS_URL, or return None when Redis is not configured"""
+        url = os.getenv("REDIS_URL")
+        if not url:
+            return None
+
+        import redis.asyncio as redis
+
+        logger.info("Using Redis for shared agent patterns and caches")
+        return cls(
+            redis.Redis.from_url(url),
+            prefix=os.getenv("REDIS_KEY_PREFIX", "blog-agent"),
+            pattern_limit=pattern_limit
+        )
+
+    def _key(self, *parts: str) -> str:
+        return ":".join((self.prefix,) + parts)
+
+    async def append_pattern(self, user_key: str, pattern: Dict[str, Any]) -> None:
+        """Append a pattern and trim the list in a single round-trip"""
+        key = self._key("pat", user_key)
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.rpush(key, orjson.dumps(pattern, default=_default))
+            pipe.ltrim(key, -self.pattern_limit, -1)
+            await pipe.execute()
+
+    async def get_patterns(self, user_key: str) -> List[Dict[str, Any]]:
+        """Return the stored patterns for a user, oldest first"""
+        raw = await self.client.lrange(self._key("pat", user_key), 0, -1)
+        return [orjson.loads(item) for item in raw]
+
+    async def get_json(self, namespace: str, key: str) -> Optional[Any]:
+        """Return a cached JSON value, or None if missing"""
+        raw = await self.client.get(self._key(namespace, key))
+        return orjson.loads(raw) if raw is not None else None
+
+    async def set_json(self, namespace: str, key: str, value: Any, ttl: float) -> None:
+        """Cache a JSON-serializable value with an expiry in seconds"""
+        await self.client.set(
+            self._key(namespace, key),
+            orjson.dumps(value, default=_default),
+            px=int(ttl * 1000)
+        )
+
+    async def close(self) -> None:
+        await self.client.close()
@@ -1,17 +1,33 @@
 import asyncio
 import logging
 import random
-from typing import Callable, Any, Optional
+import time
+from collections import Counter
+from typing import Callable, Any, Dict, Optional
 from functools import wraps
 
 logger = logging.getLogger(__name__)
 
+# Retried failures per function name. Every retry is counted, but only the
+# first few and then one in RETRY_LOG_SAMPLE_EVERY are logged, so an outage
+# that makes every request retry does not flood the log.
+_retried_failures: Counter = Counter()
+RETRY_LOG_FIRST = 10
+RETRY_LOG_SAMPLE_EVERY = 20
+
+def retry_stats() -> Dict[str, int]:
+    """Number of retried failures per function since startup"""
+    return dict(_retried_failures)
+
 class RetryError(Exception):
     """Error raised when all retry attempts are exhausted"""
     def __init__(self, message: str, last_exception: Exception):
         super().__init__(message)
         self.last_exception = last_exception
 
+class CircuitOpenError(Exception):
+    """Error raised when a call is rejected by an open circuit breaker"""
+
 async def retry_with_exponential_backoff(
     func: Callable,
     *args,
@@ -44,14 +60,16 @@ async def retry_with_exponential_backoff(
         RetryError: When all retry attempts are exhausted
     """
     last_exception = None
+    attempts = max_retries + 1  # +1 for initial attempt
     
-    for attempt in range(max_retries + 1):  # +1 for initial attempt
+    for attempt in range(attempts):
         try:
-            logger.info(f"Executing {func.__name__} (attempt {attempt + 1}/{max_retries + 1})")
+            # Lazy %-formatting: nothing is formatted unless debug logging is on
+            logger.debug("Executing %s (attempt %d/%d)", func.__name__, attempt + 1, attempts)
             result = await func(*args, **kwargs)
             
             if attempt > 0:
-                logger.info(f"{func.__name__} succeeded after {attempt} retries")
+                logger.info("%s succeeded after %d retries", func.__name__, attempt)
             
             return result
             
@@ -60,7 +78,7 @@ async def retry_with_exponential_backoff(
             
             # If this was the last attempt, raise the error
             if attempt == max_retries:
-                logger.error(f"{func.__name__} failed after {max_retries + 1} attempts: {str(e)}")
+                logger.error("%s failed after %d attempts: %s", func.__name__, attempts, e)
                 break
             
             # Calculate delay for next attempt
@@ -70,21 +88,24 @@ async def retry_with_exponential_backoff(
             if jitter:
                 delay = delay * (0.5 + random.random() * 0.5)  # 50-100% of calculated delay
             
-            logger.warning(
-                f"{func.__name__} attempt {attempt + 1} failed: {str(e)}. "
-                f"Retrying in {delay:.2f} seconds..."
-            )
+            _retried_failures[func.__name__] += 1
+            failures = _retried_failures[func.__name__]
+            if failures <= RETRY_LOG_FIRST or failures % RETRY_LOG_SAMPLE_EVERY == 0:
+                logger.warning(
+                    "%s attempt %d failed: %s. Retrying in %.2f seconds... (%d retried failures so far)",
+                    func.__name__, attempt + 1, e, delay, failures
+                )
             
             await asyncio.sleep(delay)
         
         except Exception as e:
             # Non-retryable exception
-            logger.error(f"{func.__name__} failed with non-retryable exception: {str(e)}")
+            logger.error("%s failed with non-retryable exception: %s", func.__name__, e)
             raise
     
     # All retries exhausted
     raise RetryError(
-        f"Function {func.__name__} failed after {max_retries + 1} attempts",
+        f"Function {func.__name__} failed after {attempts} attempts",
         last_exception
     )
 
@@ -140,4 +161,43 @@ class CircuitBreaker:
     ):
         self.failure_threshold = failure_threshold
         self.timeout = timeout
-        self
\ No newline at end of file
+        self.expected_exception = expected_exception
+        self.state = "CLOSED"
+        self.failure_count = 0
+        self.opened_at = 0.0
+    
+    async def call(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Call an async function through the circuit breaker.
+        
+        Raises:
+            CircuitOpenError: While the circuit is open
+        """
+        if self.state == "OPEN":
+            if time.monotonic() - self.opened_at < self.timeout:
+                raise CircuitOpenError(f"Circuit open, not calling {func.__name__}")
+            logger.info(f"Circuit half-open, trying {func.__name__}")
+            self.state = "HALF_OPEN"
+        
+        try:
+            result = await func(*args, **kwargs)
+        except self.expected_exception:
+            self._record_failure()
+            raise
+        
+        self._record_success()
+        return result
+    
+    def _record_failure(self) -> None:
+        self.failure_count += 1
+        if self.state == "HALF_OPEN" or self.failure_count >= self.failure_threshold:
+            if self.state != "OPEN":
+                logger.warning(f"Circuit opened after {self.failure_count} failures")
+            self.state = "OPEN"
+            self.opened_at = time.monotonic()
+    
+    def _record_success(self) -> None:
+        if self.state != "CLOSED":
+            logger.info("Circuit closed")
+        self.state = "CLOSED"
+        self.failure_count = 0
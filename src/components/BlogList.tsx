@@ -5,7 +5,10 @@ import './BlogList.css'
 
 const BlogList = () => {
   const [blogs, setBlogs] = useState<BlogPost[]>([])
+  const [total, setTotal] = useState(0)
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
   const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [error, setError] = useState<string | null>(null)
 
   useEffect(() => {
@@ -18,6 +21,8 @@ const BlogList = () => {
       setError(null)
       const result = await getAllBlogs()
       setBlogs(result.blogs)
+      setTotal(result.total)
+      setNextCursor(result.next_cursor ?? null)
     } catch (err) {
       console.error('Error loading blogs:', err)
       setError('Failed to load blogs. Please try again.')
@@ -26,6 +31,22 @@ const BlogList = () => {
     }
   }
 
+  const loadMoreBlogs = async () => {
+    if (!nextCursor) return
+    try {
+      setLoadingMore(true)
+      const result = await getAllBlogs(nextCursor)
+      setBlogs((current) => [...current, ...result.blogs])
+      setTotal(result.total)
+      setNextCursor(result.next_cursor ?? null)
+    } catch (err) {
+      console.error('Error loading more blogs:', err)
+      setError('Failed to load blogs. Please try again.')
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   const formatDate = (dateString: string) => {
     try {
       return new Date(dateString).toLocaleDateString('en-US', {
@@ -71,7 +92,7 @@ const BlogList = () => {
     <div className="blog-list">
       <div className="blog-list-header">
         <h2>Published Blogs</h2>
-        <p>Total: {blogs.length} blogs</p>
+        <p>Total: {total} blogs</p>
         <button onClick={loadBlogs} className="btn-secondary">
           Refresh
         </button>
@@ -100,9 +121,9 @@ const BlogList = () => {
               
               <div className="blog-content-preview">
                 <p>
-                  {blog.content.length > 200 
-                    ? `${blog.content.substring(0, 200)}...` 
-                    : blog.content
+                  {(blog.excerpt ?? blog.content).length > 200 
+                    ? `${(blog.excerpt ?? blog.content).substring(0, 200)}...` 
+                    : (blog.excerpt ?? blog.content)
                   }
                 </p>
               </div>
@@ -117,6 +138,14 @@ const BlogList = () => {
           ))}
         </div>
       )}
+
+      {nextCursor && (
+        <div className="blog-list-more">
+          <button onClick={loadMoreBlogs} className="btn-secondary" disabled={loadingMore}>
+            {loadingMore ? 'Loading...' : 'Load more'}
+          </button>
+        </div>
+      )}
     </div>
   )
 }
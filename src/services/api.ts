@@ -9,6 +9,7 @@ export interface BlogPost {
   id?: number
   title: string
   content: string
+  excerpt?: string // list endpoint returns the first 300 characters instead of content
   user_id?: number
   author_name?: string
   author_email?: string
@@ -394,9 +395,11 @@ export const publishBlog = async (blog: BlogPost): Promise<{ message: string; bl
   }
 }
 
-export const getAllBlogs = async (): Promise<{ blogs: BlogPost[]; total: number }> => {
+export const getAllBlogs = async (cursor?: string | null): Promise<{ blogs: BlogPost[]; count: number; total: number; next_cursor?: string | null }> => {
   try {
-    const response = await fetch(`${API_BASE_URL}/blogs`, {
+    // The list is paginated; pass the previous page's next_cursor to get the next one
+    const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : ''
+    const response = await fetch(`${API_BASE_URL}/blogs${query}`, {
       method: 'GET',
       headers: {
         'Content-Type': 'application/json',